@@ -1,10 +1,51 @@
 import math
-import copy
+import operator
+import time
+from ai.transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+from ai.symmetry import get_board_symmetries
+from ai.search_stats import SearchStats, append_stats_log
+from ai.tablebase import get_tablebase
+from ai.zobrist import get_zobrist_keys
+
+# Penalty for the side to move when every empty cell lets the opponent complete an OSO next.
+# A multiple of 0.25, so scores stay exact and parallel ties resolve like the serial search
+NO_SAFE_MOVE_WEIGHT = 1.0
+
+class SearchTimeout(Exception):
+    pass
 
 class AIManager:
-    def __init__(self, game_manager, ai_player=2, max_depth=3):
+    def __init__(self, game_manager, ai_player=2, max_depth=3, tt_size=262144, time_budget_ms=None, workers=1, use_tablebase=True, stats_log=None):
         self.game_manager = game_manager
         self.ai_player = ai_player
+        self.time_budget_ms = time_budget_ms
+        self.tt_size = tt_size
+        self.search_depth = 0
+        self.completed_depth = 0
+        self.deadline = None
+        self.stop_event = None
+        self.partial_best = None
+        self.nodes = 0
+        # Statistics of the search in progress and of the last finished one; each finished
+        # search is also appended to the stats_log file (JSON lines) when one is given
+        self.stats = SearchStats("minimax", game_manager.board_size)
+        self.last_stats = None
+        self.ponder_stats = None
+        self.stats_log = stats_log
+        # Move ordering: two killer moves per ply and a history score per move
+        self.killers = []
+        self.history = {}
+        self.zobrist = get_zobrist_keys(game_manager.board_size)
+        self.symmetries = get_board_symmetries(game_manager.board_size)
+        self.transposition_table = TranspositionTable(tt_size)
+        # Boards with a solved tablebase on disk are played from it without searching; it is
+        # opened by the first search, so engines that never search don't map it
+        self.use_tablebase = use_tablebase
+        self.tablebase = None
+        self.parallel_search = None
+        if workers > 1:
+            from ai.parallel_search import ParallelRootSearch
+            self.parallel_search = ParallelRootSearch(workers)
 
         if self.game_manager.board_size >= 9:
             self.max_depth = 1
@@ -13,68 +54,324 @@ class AIManager:
         else:
             self.max_depth = 3
 
-    def best_move(self):
-        best_score = -math.inf
+    def best_move(self, state=None, stop_event=None, ponder=False):
+        # The search plays and takes back moves on the game (the live one unless a copy is
+        # given), leaving it as it found it. Setting stop_event ends it like a timeout; a
+        # ponder search ignores the time budget and deepens until it is stopped.
+        if state is None:
+            state = self.game_manager
+        self.stop_event = stop_event
+        start = time.perf_counter()
+        self.stats = SearchStats("minimax", state.board_size, ponder)
+        if self.use_tablebase and self.tablebase is None:
+            self.tablebase = get_tablebase(state.board_size)
+            # Boards without a file don't look for one again
+            self.use_tablebase = self.tablebase is not None
+        if self.tablebase is not None:
+            self.stats.engine = "tablebase"
+            self.stats.tt_probes = None
+            self.stats.tt_hits = None
+            self.nodes = 0
+            self.completed_depth = state.empty_count
+            best_move = self.tablebase.best_move(state)
+            self.finish_stats(state, best_move, start)
+            return best_move
+        hashes = self.zobrist.hash_board_symmetries(state)
+        # Root moves that a symmetry of the current board maps onto each other score the same
+        stabilizer = self.symmetries.stabilizer(state)
+        root_history = len(state.move_history)
+        self.transposition_table.new_search()
+        self.nodes = 0
+        self.completed_depth = 0
+        self.deadline = None
+        self.killers = [[None, None] for _ in range(state.empty_count + 1)]
+        for move in self.history:
+            self.history[move] //= 2
+
+        # Without a time budget, deepen up to the board-size depth; with one, until time runs out
+        if ponder:
+            max_depth = state.empty_count
+        elif self.time_budget_ms is None:
+            max_depth = min(self.max_depth, state.empty_count)
+        else:
+            max_depth = state.empty_count
+            budget = self.time_budget_ms / 1000
+            self.deadline = start + budget
+
         best_move = None
+        for depth in range(1, max_depth + 1):
+            iteration_start = time.perf_counter()
+            moves = self.root_moves(state, stabilizer, best_move)
+            try:
+                if self.parallel_search is not None:
+                    best_move = self.parallel_search.search_root(self, state, depth, moves)
+                else:
+                    best_move = self.search_root(state, depth, hashes, moves)
+            except SearchTimeout:
+                while len(state.move_history) > root_history:
+                    state.undo_move()
+                # Only fall back to a partly searched root if no iteration finished at all
+                if best_move is None:
+                    best_move = self.partial_best
+                break
+            self.completed_depth = depth
+            self.stats.depth_times.append((depth, time.perf_counter() - iteration_start, self.nodes))
+            if stop_event is not None and stop_event.is_set():
+                break
 
-        for r in range(self.game_manager.board_size):
-            for c in range(self.game_manager.board_size):
-                if self.game_manager.board[r][c] == '':
-                    for letter in ['O', 'S']:
-                        sim_game = copy.deepcopy(self.game_manager)
-                        sim_game.set_selected_letter(letter)
-                        valid, points = sim_game.place_letter(r, c)
-                        if not valid:
-                            continue
+            if self.time_budget_ms is not None and not ponder:
+                # The next iteration costs more than all previous ones; don't start one that can't finish
+                elapsed = time.perf_counter() - start
+                if elapsed * 2 > budget:
+                    break
 
-                        score = self.minimax(sim_game, False, 1, -math.inf, math.inf)
+        if best_move is None:
+            best_move = next(state.legal_moves(), None)
+        self.finish_stats(state, best_move, start)
+        return best_move
 
-                        if score > best_score:
-                            best_score = score
-                            best_move = (r, c, letter)
+    def finish_stats(self, state, best_move, start):
+        stats = self.stats
+        stats.elapsed = time.perf_counter() - start
+        stats.nodes = self.nodes
+        stats.best_move = best_move
+        stats.completed_depth = self.completed_depth
+        if best_move is not None:
+            state.apply_move(*best_move)
+            stats.principal_variation = [best_move] + self.table_line(state, max(self.completed_depth - 1, 0))
+            state.undo_move()
+        # A ponder search only becomes the last search if its move is played
+        if stats.ponder:
+            self.ponder_stats = stats
+        else:
+            self.last_stats = stats
+        if self.stats_log:
+            append_stats_log(self.stats_log, stats)
+
+    def root_moves(self, state, stabilizer, previous_best):
+        # The root order only depends on the position and the previous iteration, so serial and
+        # parallel searches break ties between equal scores the same way
+        moves = []
+        for r, c, letter in state.legal_moves():
+            cell = r * state.board_size + c
+            if len(stabilizer) > 1 and any(self.symmetries.perms[g][cell] < cell for g in stabilizer):
+                continue
+            moves.append((r, c, letter))
+        moves.sort(key=lambda move: (move == previous_best, state.move_points(*move)), reverse=True)
+        return moves
+
+    def search_root(self, state, depth, hashes, moves):
+        self.search_depth = depth
+        maximizing = state.current_player == self.ai_player
+        best_score = -math.inf if maximizing else math.inf
+        best_move = None
+        self.partial_best = None
+        self.stats.expanded_nodes += 1
+        self.stats.moves_searched += len(moves)
+
+        for r, c, letter in moves:
+            state.apply_move(r, c, letter)
+            child_hashes = tuple(map(operator.xor, hashes, self.zobrist.symmetric_letter_keys(r * state.board_size + c, letter)))
+            if maximizing:
+                score = self.minimax(state, 1, best_score, math.inf, child_hashes)
+            else:
+                score = self.minimax(state, 1, -math.inf, best_score, child_hashes)
+            state.undo_move()
+
+            if (score > best_score) if maximizing else (score < best_score):
+                best_score = score
+                best_move = (r, c, letter)
+                self.partial_best = best_move
         return best_move
 
-    def minimax(self, state, is_maximizing, depth, alpha, beta):
-        if depth == self.max_depth or state.is_full():
+    def predicted_line(self, state, player):
+        # Follow the table's best moves for as long as `player` keeps the turn
+        return self.table_line(state, state.empty_count, player)
+
+    def table_line(self, state, max_length, player=None):
+        line = []
+        while len(line) < max_length and not state.is_full() and (player is None or state.current_player == player):
+            hashes = self.zobrist.hash_board_symmetries(state)
+            board_hash = min(hashes)
+            entry = self.transposition_table.probe(self.zobrist.position_key(board_hash, state))
+            if entry is None or entry[4] is None:
+                break
+            move = self.symmetries.from_canonical(entry[4], hashes.index(board_hash))
+            if not state.is_empty(move[0], move[1]):
+                break
+            state.apply_move(*move)
+            line.append(move)
+        for _ in line:
+            state.undo_move()
+        return line
+
+    def out_of_time(self):
+        if self.stop_event is not None and self.stop_event.is_set():
+            return True
+        return self.deadline is not None and time.perf_counter() > self.deadline
+
+    def close(self):
+        if self.parallel_search is not None:
+            self.parallel_search.close()
+            self.parallel_search = None
+
+    def minimax(self, state, depth, alpha, beta, hashes):
+        self.nodes += 1
+        if self.nodes & 255 == 0 and self.out_of_time():
+            raise SearchTimeout()
+
+        if state.is_full():
             return self.evaluate(state)
+        if depth >= self.search_depth:
+            return self.quiescence(state)
+
+        remaining = self.search_depth - depth
+        # Symmetric positions share one entry: the orientation with the smallest hash is canonical,
+        # and stored moves are kept in that orientation
+        board_hash = min(hashes)
+        orientation = hashes.index(board_hash)
+        key = self.zobrist.position_key(board_hash, state)
+        hash_move = None
+        entry = self.transposition_table.probe(key)
+        self.stats.tt_probes += 1
+        if entry is not None:
+            self.stats.tt_hits += 1
+            _, entry_depth, value, flag, canonical_move, _ = entry
+            hash_move = self.symmetries.from_canonical(canonical_move, orientation)
+            # Only same-depth entries give cutoffs, so a score never depends on what earlier
+            # searches left in the table and parallel workers agree with the serial search
+            if entry_depth == remaining:
+                if flag == EXACT:
+                    return value
+                if flag == LOWER_BOUND:
+                    alpha = max(alpha, value)
+                elif flag == UPPER_BOUND:
+                    beta = min(beta, value)
+                if beta <= alpha:
+                    return value
+
+        # A scoring move keeps the turn, so the side to move decides who is maximizing
+        is_maximizing = state.current_player == self.ai_player
+        alpha_orig = alpha
+        beta_orig = beta
+        best_eval = -math.inf if is_maximizing else math.inf
+        best_move = None
+        searched = 0
+        for r, c, letter in self.ordered_moves(state, depth, hash_move):
+            searched += 1
+            state.apply_move(r, c, letter)
+            keys = self.zobrist.symmetric_letter_keys(r * state.board_size + c, letter)
+            eval = self.minimax(state, depth + 1, alpha, beta, tuple(map(operator.xor, hashes, keys)))
+            state.undo_move()
+            if is_maximizing:
+                if eval > best_eval:
+                    best_eval = eval
+                    best_move = (r, c, letter)
+                alpha = max(alpha, eval)
+            else:
+                if eval < best_eval:
+                    best_eval = eval
+                    best_move = (r, c, letter)
+                beta = min(beta, eval)
+            if beta <= alpha:
+                self.record_cutoff(state, depth, remaining, (r, c, letter))
+                self.stats.cutoffs[depth] = self.stats.cutoffs.get(depth, 0) + 1
+                break
+        self.stats.expanded_nodes += 1
+        self.stats.moves_searched += searched
 
-        if is_maximizing:
-            max_eval = -math.inf
-            for r in range(state.board_size):
-                for c in range(state.board_size):
-                    if state.board[r][c] == '':
-                        for letter in ['O', 'S']:
-                            new_state = copy.deepcopy(state)
-                            new_state.set_selected_letter(letter)
-                            valid, points = new_state.place_letter(r, c)
-                            if not valid:
-                                continue
-                            eval = self.minimax(new_state, False, depth + 1, alpha, beta)
-                            max_eval = max(max_eval, eval)
-                            alpha = max(alpha, eval)
-                            if beta <= alpha:
-                                break
-            return max_eval
+        if best_eval <= alpha_orig:
+            flag = UPPER_BOUND
+        elif best_eval >= beta_orig:
+            flag = LOWER_BOUND
         else:
-            min_eval = math.inf
-            for r in range(state.board_size):
-                for c in range(state.board_size):
-                    if state.board[r][c] == '':
-                        for letter in ['O', 'S']:
-                            new_state = copy.deepcopy(state)
-                            new_state.set_selected_letter(letter)
-                            valid, points = new_state.place_letter(r, c)
-                            if not valid:
-                                continue
-                            eval = self.minimax(new_state, True, depth + 1, alpha, beta)
-                            min_eval = min(min_eval, eval)
-                            beta = min(beta, eval)
-                            if beta <= alpha:
-                                break
-            return min_eval
+            flag = EXACT
+        self.transposition_table.store(key, remaining, best_eval, flag, self.symmetries.to_canonical(best_move, orientation))
+        return best_eval
+
+    def quiescence(self, state):
+        # Past the depth limit, the side to move keeps cashing in its best scoring move until none is left
+        played = 0
+        while True:
+            self.nodes += 1
+            if self.nodes & 255 == 0 and self.out_of_time():
+                raise SearchTimeout()
+
+            o_cells, s_cells = state.scoring_cells()
+            cells = o_cells | s_cells
+            best_points = 0
+            best_move = None
+            while cells:
+                bit = cells & -cells
+                cells ^= bit
+                r, c = divmod(bit.bit_length() - 1, state.board_size)
+                for letter, letter_cells in (('O', o_cells), ('S', s_cells)):
+                    if letter_cells & bit:
+                        points = state.move_points(r, c, letter)
+                        if points > best_points:
+                            best_points = points
+                            best_move = (r, c, letter)
+            if best_move is None:
+                break
+            state.apply_move(*best_move)
+            played += 1
+
+        value = self.evaluate(state)
+        for _ in range(played):
+            state.undo_move()
+        return value
+
+    def ordered_moves(self, state, depth, hash_move):
+        # Hash move first, then moves that complete an OSO, then killers, then history
+        if hash_move is not None:
+            yield hash_move
+        killers = self.killers[depth] if depth < len(self.killers) else ()
+        o_cells, s_cells = state.scoring_cells()
+        size = state.board_size
+        scored = []
+        for move in state.legal_moves():
+            if move == hash_move:
+                continue
+            r, c, letter = move
+            bit = 1 << (r * size + c)
+            points = state.move_points(r, c, letter) if (o_cells if letter == 'O' else s_cells) & bit else 0
+            if points:
+                order = (2, points)
+            elif move in killers:
+                order = (1, 1 if move == killers[0] else 0)
+            else:
+                order = (0, self.history.get(move, 0))
+            scored.append((order, move))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        for _, move in scored:
+            yield move
+
+    def record_cutoff(self, state, depth, remaining, move):
+        # Scoring moves are ordered first anyway; only quiet moves feed killers and history
+        if state.move_points(*move):
+            return
+        if depth < len(self.killers):
+            killers = self.killers[depth]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
+        self.history[move] = self.history.get(move, 0) + remaining * remaining
 
     def evaluate(self, state):
+        self.stats.leaf_evaluations += 1
         ai_points = state.players_points.get(self.ai_player, 0)
         human_player = 1 if self.ai_player == 2 else 2
         human_points = state.players_points.get(human_player, 0)
-        return ai_points - human_points
+        if state.empty_count == 0:
+            return ai_points - human_points
+        # Leaves come after quiescence, so the side to move has nothing to complete and must
+        # play a quiet move; the safe cells left decide who runs out of them first
+        sign = 1 if state.current_player == self.ai_player else -1
+        return ai_points - human_points + sign * self.quiet_move_score(state)
+
+    def quiet_move_score(self, state):
+        # An empty cell is safe if an O or an S placed there hands the opponent no OSO
+        o_unsafe, s_unsafe = state.triple_index.giveaway_cells(state.o_mask, state.s_mask, state.occupied)
+        if bin(o_unsafe & s_unsafe).count('1') < state.empty_count:
+            return 0
+        return -NO_SAFE_MOVE_WEIGHT
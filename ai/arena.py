@@ -0,0 +1,139 @@
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from ai.engines import create_engine
+from game.game_manager import GameManager
+import settings.settings_manager as settings_manager
+
+# Engine configurations have the shape of the "ai" section of settings.json, plus "engine" (an
+# opponent key such as "ia" or "mcts") and an optional "max_depth" for untimed minimax
+
+def play_game(config_a, config_b, board_size, a_player, seed, opening_moves):
+    # A few random opening moves so repeated games between deterministic engines differ
+    game = GameManager(board_size)
+    rng = random.Random(seed)
+    for _ in range(min(opening_moves, board_size * board_size)):
+        row, col = rng.choice(list(game.empty_cells()))
+        game.apply_move(row, col, rng.choice('OS'))
+
+    b_player = 1 if a_player == 2 else 2
+    engines = {
+        a_player: create_engine(config_a.get("engine", "ia"), game, config_a, ai_player=a_player),
+        b_player: create_engine(config_b.get("engine", "ia"), game, config_b, ai_player=b_player),
+    }
+    think_time = {a_player: 0.0, b_player: 0.0}
+    nodes = {a_player: 0, b_player: 0}
+    moves = {a_player: 0, b_player: 0}
+    while not game.is_full():
+        player = game.get_current_player()
+        engine = engines[player]
+        start = time.perf_counter()
+        move = engine.best_move()
+        think_time[player] += time.perf_counter() - start
+        nodes[player] += engine.nodes
+        moves[player] += 1
+        game.apply_move(*move)
+    for engine in engines.values():
+        engine.close()
+
+    return {
+        "board_size": board_size,
+        "a_player": a_player,
+        "a_points": game.get_player_points(a_player),
+        "b_points": game.get_player_points(b_player),
+        "a": {"think_time": think_time[a_player], "nodes": nodes[a_player], "moves": moves[a_player]},
+        "b": {"think_time": think_time[b_player], "nodes": nodes[b_player], "moves": moves[b_player]},
+    }
+
+def summarize(results):
+    totals = {"games": 0, "wins": 0, "draws": 0, "losses": 0, "a_points": 0, "b_points": 0,
+              "a": {"think_time": 0.0, "nodes": 0, "moves": 0},
+              "b": {"think_time": 0.0, "nodes": 0, "moves": 0}}
+    for result in results:
+        totals["games"] += 1
+        if result["a_points"] > result["b_points"]:
+            totals["wins"] += 1
+        elif result["a_points"] < result["b_points"]:
+            totals["losses"] += 1
+        else:
+            totals["draws"] += 1
+        totals["a_points"] += result["a_points"]
+        totals["b_points"] += result["b_points"]
+        for side in ("a", "b"):
+            for key in ("think_time", "nodes", "moves"):
+                totals[side][key] += result[side][key]
+
+    # Wins, draws and losses are engine A's
+    summary = {key: totals[key] for key in ("games", "wins", "draws", "losses")}
+    games = max(totals["games"], 1)
+    summary["score"] = (totals["wins"] + totals["draws"] / 2) / games
+    summary["average_margin"] = (totals["a_points"] - totals["b_points"]) / games
+    for side in ("a", "b"):
+        side_totals = totals[side]
+        think_time = side_totals["think_time"]
+        summary[f"engine_{side}"] = {
+            "moves": side_totals["moves"],
+            "nodes": side_totals["nodes"],
+            "average_think_ms": think_time * 1000 / side_totals["moves"] if side_totals["moves"] else 0,
+            "nodes_per_second": side_totals["nodes"] / think_time if think_time else 0,
+        }
+    return summary
+
+def run_arena(config_a, config_b, board_sizes, games, workers=None, seed=0, opening_moves=2):
+    # Each pair of games shares an opening, with the engines swapping who moves first
+    jobs = []
+    for board_size in board_sizes:
+        for game_number in range(games):
+            a_player = 1 if game_number % 2 == 0 else 2
+            jobs.append((config_a, config_b, board_size, a_player, seed + game_number // 2, opening_moves))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(play_game, *job) for job in jobs]
+        results = [future.result() for future in futures]
+
+    report = {
+        "engine_a": config_a,
+        "engine_b": config_b,
+        "overall": summarize(results),
+        "board_sizes": {},
+    }
+    for board_size in board_sizes:
+        report["board_sizes"][str(board_size)] = summarize([result for result in results if result["board_size"] == board_size])
+    return report
+
+def engine_config(text):
+    # Settings from settings.json, overridden by a JSON object given on the command line
+    config = dict(settings_manager.get_ai_settings())
+    config["workers"] = 1
+    overrides = json.loads(text)
+    # A time budget makes the minimax search ignore max_depth, so a depth-limited engine drops
+    # the budget it would inherit from settings.json
+    if overrides.get("max_depth") is not None and overrides.get("engine", config.get("engine", "ia")) != "mcts":
+        if overrides.get("time_budget_ms") is not None:
+            raise argparse.ArgumentTypeError("set max_depth or time_budget_ms, not both")
+        config["time_budget_ms"] = None
+    config.update(overrides)
+    return config
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play engine A against engine B without the GUI and report the results as JSON.")
+    parser.add_argument("--a", type=engine_config, default=engine_config("{}"), help='engine A, e.g. \'{"engine": "ia", "time_budget_ms": 200}\'; a minimax engine given "max_depth" searches to that depth with no time budget')
+    parser.add_argument("--b", type=engine_config, default=engine_config('{"engine": "mcts"}'), help="engine B, in the same form")
+    parser.add_argument("--sizes", nargs="*", type=int, default=None, help="board sizes (default: the ones in settings.json)")
+    parser.add_argument("--games", type=int, default=10, help="games per board size")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--opening-moves", type=int, default=2)
+    parser.add_argument("--output", help="also write the report to this file")
+    args = parser.parse_args()
+
+    board_sizes = args.sizes or settings_manager.get_board_sizes()
+    report = run_arena(args.a, args.b, board_sizes, args.games, args.workers, args.seed, args.opening_moves)
+    text = json.dumps(report, indent=4)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
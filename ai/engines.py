@@ -0,0 +1,28 @@
+from ai.ai_manager import AIManager
+from ai.mcts_manager import MCTSManager, MAX_TREE_NODES
+
+# Opponent keys from settings.json that are played by the computer
+AI_OPPONENTS = ('ai', 'ia', 'mcts')
+
+def create_engine(opponent, game_manager, ai_settings, ai_player=2):
+    if opponent == 'mcts':
+        return MCTSManager(
+            game_manager,
+            ai_player=ai_player,
+            time_budget_ms=ai_settings.get("time_budget_ms", 1000),
+            playouts=ai_settings.get("mcts_playouts"),
+            exploration=ai_settings.get("mcts_exploration", 1.4),
+            max_nodes=ai_settings.get("mcts_max_nodes", MAX_TREE_NODES),
+            stats_log=ai_settings.get("stats_log"))
+    engine = AIManager(
+        game_manager,
+        ai_player=ai_player,
+        tt_size=ai_settings.get("transposition_table_size", 262144),
+        time_budget_ms=ai_settings.get("time_budget_ms"),
+        workers=ai_settings.get("workers", 1),
+        use_tablebase=ai_settings.get("use_tablebase", True),
+        stats_log=ai_settings.get("stats_log"))
+    # Without a time budget the search depth follows the board size unless one is given
+    if ai_settings.get("max_depth") is not None:
+        engine.max_depth = ai_settings["max_depth"]
+    return engine
@@ -0,0 +1,290 @@
+import copy
+import math
+import random
+import time
+from ai.search_stats import SearchStats, append_stats_log
+
+# Random quiet moves a playout tries before settling for one that gives the opponent an OSO
+SAFE_MOVE_TRIES = 8
+# Most nodes a tree may hold; past it, searches keep running playouts from the leaves they reach
+MAX_TREE_NODES = 100000
+
+class MCTSNode:
+    __slots__ = ("move", "parent", "player", "children", "untried", "visits", "wins")
+
+    def __init__(self, move, parent, player, untried):
+        self.move = move
+        self.parent = parent
+        # The player who made `move`; `wins` sums playout rewards from their point of view
+        self.player = player
+        self.children = []
+        # Moves not expanded yet, as [O cells, S cells] mask pairs; see expansion_moves()
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0
+
+class MCTSManager:
+    def __init__(self, game_manager, ai_player=2, time_budget_ms=1000, playouts=None, exploration=1.4, seed=None, stats_log=None, max_nodes=MAX_TREE_NODES):
+        self.game_manager = game_manager
+        self.ai_player = ai_player
+        self.time_budget_ms = time_budget_ms
+        # Without a time budget, a fixed number of playouts per move
+        self.playouts = playouts if playouts is not None or time_budget_ms is not None else 5000
+        self.exploration = exploration
+        self.max_nodes = max_nodes
+        self.random = random.Random(seed)
+        self.max_depth = 1
+        self.completed_depth = 0
+        self.nodes = 0
+        # The tree from the last search and the position at its root, kept to be reused
+        self.root = None
+        self.root_state = None
+        self.tree_nodes = 0
+        self.last_stats = None
+        self.ponder_stats = None
+        self.stats_log = stats_log
+
+    def best_move(self, state=None, stop_event=None, ponder=False):
+        # Plays and takes back moves on the game (the live one unless a copy is given), leaving
+        # it as it found it. Setting stop_event ends the search; a ponder search runs until then.
+        if state is None:
+            state = self.game_manager
+        root = self.find_node(state)
+        if root is None:
+            root = MCTSNode(None, None, None, self.expansion_moves(state))
+        root.parent = None
+        self.tree_nodes = self.count_nodes(root)
+        self.root = root
+        self.root_state = copy.deepcopy(state)
+        self.nodes = 0
+        self.completed_depth = 0
+        start = time.perf_counter()
+
+        deadline = None
+        if self.time_budget_ms is not None and not ponder:
+            deadline = time.perf_counter() + self.time_budget_ms / 1000
+        while True:
+            if stop_event is not None and stop_event.is_set():
+                break
+            if not ponder:
+                if self.playouts is not None and self.nodes >= self.playouts:
+                    break
+                if deadline is not None and self.nodes & 15 == 0 and time.perf_counter() > deadline:
+                    break
+            self.run_playout(state, root)
+            self.nodes += 1
+        if self.playouts is None or self.nodes >= self.playouts:
+            self.completed_depth = 1
+
+        if not root.children:
+            best_move = next(state.legal_moves(), None)
+        else:
+            best_move = max(root.children, key=lambda child: (child.visits, child.wins)).move
+        self.finish_stats(state, root, best_move, start, ponder)
+        return best_move
+
+    def finish_stats(self, state, root, best_move, start, ponder):
+        stats = SearchStats("mcts", state.board_size, ponder)
+        stats.tt_probes = None
+        stats.tt_hits = None
+        stats.elapsed = time.perf_counter() - start
+        stats.nodes = self.nodes
+        stats.leaf_evaluations = self.nodes
+        stats.best_move = best_move
+        stats.completed_depth = self.completed_depth
+        # Every tree node with children counts as expanded, whatever search added it
+        pending = [root]
+        while pending:
+            node = pending.pop()
+            if node.children:
+                stats.expanded_nodes += 1
+                stats.moves_searched += len(node.children)
+                pending.extend(node.children)
+        node = root
+        while node.children:
+            node = max(node.children, key=lambda child: child.visits)
+            stats.principal_variation.append(node.move)
+        # A ponder search only becomes the last search if its move is played
+        if stats.ponder:
+            self.ponder_stats = stats
+        else:
+            self.last_stats = stats
+        if self.stats_log:
+            append_stats_log(self.stats_log, stats)
+
+    def run_playout(self, state, root):
+        # Selection and expansion on the game itself, then a playout on plain masks
+        node = root
+        played = 0
+        while not node.untried and node.children:
+            node = self.select_child(node)
+            state.apply_move(*node.move)
+            played += 1
+        if node.untried and self.tree_nodes < self.max_nodes:
+            move = self.next_untried(node, state.board_size)
+            player = state.current_player
+            state.apply_move(*move)
+            played += 1
+            child = MCTSNode(move, node, player, self.expansion_moves(state))
+            node.children.append(child)
+            self.tree_nodes += 1
+            node = child
+
+        points = self.playout(state)
+        # Playouts are scored by margin rather than just win or loss, squashed into 0..1
+        reward_1 = 0.5 + 0.5 * math.tanh((points[1] - points[2]) / 4)
+        while node is not None:
+            node.visits += 1
+            if node.player is not None:
+                node.wins += reward_1 if node.player == 1 else 1 - reward_1
+            node = node.parent
+
+        for _ in range(played):
+            state.undo_move()
+
+    def select_child(self, node):
+        log_visits = math.log(node.visits)
+        exploration = self.exploration
+        best_child = None
+        best_value = -math.inf
+        for child in node.children:
+            value = child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best_value = value
+                best_child = child
+        return best_child
+
+    def expansion_moves(self, state):
+        # Untried moves as [O cells, S cells] mask pairs, drawn from the last pair first: moves
+        # that complete an OSO, then moves that hand the opponent none. Moves that give an OSO
+        # away are only considered when every quiet move does.
+        empty = ((1 << (state.board_size * state.board_size)) - 1) & ~state.occupied
+        index = state.triple_index
+        o_cells, s_cells = index.scoring_cells(state.o_mask, state.s_mask, state.occupied)
+        o_unsafe, s_unsafe = index.giveaway_cells(state.o_mask, state.s_mask, state.occupied)
+        untried = []
+        o_safe = empty & ~o_cells & ~o_unsafe
+        s_safe = empty & ~s_cells & ~s_unsafe
+        if o_safe or s_safe:
+            untried.append([o_safe, s_safe])
+        if o_cells or s_cells:
+            untried.append([o_cells, s_cells])
+        if not untried and empty:
+            untried.append([empty, empty])
+        return untried
+
+    def next_untried(self, node, board_size):
+        # Takes a random move out of the node's highest-priority untried pair
+        masks = node.untried[-1]
+        o_count = bin(masks[0]).count('1')
+        i = self.random.randrange(o_count + bin(masks[1]).count('1'))
+        which = 0 if i < o_count else 1
+        if which:
+            i -= o_count
+        cells = masks[which]
+        for _ in range(i):
+            cells &= cells - 1
+        bit = cells & -cells
+        masks[which] ^= bit
+        if not masks[0] and not masks[1]:
+            node.untried.pop()
+        r, c = divmod(bit.bit_length() - 1, board_size)
+        return r, c, 'OS'[which]
+
+    def playout(self, state):
+        # Plays the game out on local masks: the side to move always cashes in an OSO when it
+        # can, and otherwise puts a random letter on a random empty cell
+        index = state.triple_index
+        rand = self.random.random
+        o_mask = state.o_mask
+        s_mask = state.s_mask
+        player = state.current_player
+        points = [0, state.players_points[1], state.players_points[2]]
+        empties = [r * state.board_size + c for r, c in state.empty_cells()]
+        while empties:
+            o_cells, s_cells = index.scoring_cells(o_mask, s_mask, o_mask | s_mask)
+            if o_cells or s_cells:
+                if s_cells:
+                    bit = s_cells & -s_cells
+                    letter = 'S'
+                else:
+                    bit = o_cells & -o_cells
+                    letter = 'O'
+                cell = bit.bit_length() - 1
+                points[player] += index.letter_points(o_mask, s_mask, cell, letter)
+                empties.remove(cell)
+                if letter == 'O':
+                    o_mask |= bit
+                else:
+                    s_mask |= bit
+            else:
+                # Prefer a quiet move that leaves the opponent nothing to score, trying a few
+                o_unsafe, s_unsafe = index.giveaway_cells(o_mask, s_mask, o_mask | s_mask)
+                for _ in range(SAFE_MOVE_TRIES):
+                    i = int(rand() * len(empties))
+                    bit = 1 << empties[i]
+                    is_o = rand() < 0.5
+                    if not (o_unsafe if is_o else s_unsafe) & bit:
+                        break
+                if is_o:
+                    o_mask |= bit
+                else:
+                    s_mask |= bit
+                empties[i] = empties[-1]
+                empties.pop()
+                player = 3 - player
+        return points
+
+    def find_node(self, state):
+        # The node of the last tree for this position, reached by replaying tree moves that
+        # are on the board now
+        if self.root is None or self.root_state.board_size != state.board_size:
+            return None
+        base = self.root_state
+        if base.o_mask & ~state.o_mask or base.s_mask & ~state.s_mask:
+            return None
+        target = self.position_signature(state)
+        return self.match_node(self.root, copy.deepcopy(base), state, target)
+
+    def match_node(self, node, walk, state, target):
+        if self.position_signature(walk) == target:
+            return node
+        for child in node.children:
+            r, c, letter = child.move
+            if state.get_cell(r, c) == letter:
+                walk.apply_move(r, c, letter)
+                found = self.match_node(child, walk, state, target)
+                walk.undo_move()
+                if found is not None:
+                    return found
+        return None
+
+    def position_signature(self, state):
+        return (state.o_mask, state.s_mask, state.current_player,
+                state.players_points[1], state.players_points[2])
+
+    def predicted_line(self, state, player):
+        # The most visited moves of the last tree for as long as `player` keeps the turn
+        line = []
+        node = self.find_node(state)
+        while node is not None and node.children and state.current_player == player:
+            node = max(node.children, key=lambda child: child.visits)
+            state.apply_move(*node.move)
+            line.append(node.move)
+        for _ in line:
+            state.undo_move()
+        return line
+
+    def count_nodes(self, root):
+        count = 0
+        pending = [root]
+        while pending:
+            node = pending.pop()
+            count += 1
+            pending.extend(node.children)
+        return count
+
+    def close(self):
+        self.root = None
+        self.root_state = None
+        self.tree_nodes = 0
@@ -0,0 +1,132 @@
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError, wait
+from ai.ai_manager import AIManager, SearchTimeout
+
+# Searching this far below the best score so far lets a move that ties it come back as an exact
+# score, so the parallel search can apply the serial tie-break (earliest root move wins)
+TIE_MARGIN = 1e-6
+
+_shared_bound = None
+_stopped_search = None
+_engines = {}
+
+def _init_worker(shared_bound, stopped_search):
+    global _shared_bound, _stopped_search
+    _shared_bound = shared_bound
+    _stopped_search = stopped_search
+
+class SearchStopped:
+    # Stands in for the engine's stop event inside a worker: set once the parent process has
+    # stopped the search with this id or a later one
+    def __init__(self, search_id):
+        self.search_id = search_id
+
+    def is_set(self):
+        return _stopped_search.value >= self.search_id
+
+def _search_root_move(state, move, ai_player, tt_size, depth, wall_deadline, search_id):
+    # Each worker process keeps one engine per configuration, so its table survives between moves
+    key = (state.board_size, ai_player, tt_size)
+    engine = _engines.get(key)
+    if engine is None:
+        engine = AIManager(state, ai_player=ai_player, tt_size=tt_size, use_tablebase=False)
+        engine.search_id = None
+        _engines[key] = engine
+    if engine.search_id != search_id:
+        engine.search_id = search_id
+        engine.transposition_table.new_search()
+        engine.killers = [[None, None] for _ in range(state.empty_count + 1)]
+    engine.game_manager = state
+    engine.search_depth = depth
+    engine.nodes = 0
+    engine.deadline = None
+    engine.stop_event = SearchStopped(search_id)
+    if engine.stop_event.is_set():
+        return None, 0
+    if wall_deadline is not None:
+        engine.deadline = time.perf_counter() + wall_deadline - time.time()
+
+    # The shared bound is the best score found so far, from the root mover's point of view
+    sign = 1 if state.current_player == ai_player else -1
+    bound = _shared_bound.value - TIE_MARGIN
+    r, c, letter = move
+    state.apply_move(r, c, letter)
+    hashes = engine.zobrist.hash_board_symmetries(state)
+    try:
+        if sign > 0:
+            score = engine.minimax(state, 1, bound, math.inf, hashes)
+        else:
+            score = engine.minimax(state, 1, -math.inf, -bound, hashes)
+    except SearchTimeout:
+        return None, engine.nodes
+
+    score *= sign
+    exact = score > bound
+    if exact:
+        with _shared_bound.get_lock():
+            if score > _shared_bound.value:
+                _shared_bound.value = score
+    return (score, exact), engine.nodes
+
+class ParallelRootSearch:
+    def __init__(self, workers):
+        self.workers = workers
+        self.search_id = 0
+        self.shared_bound = multiprocessing.Value('d', -math.inf)
+        # Id of the latest search the parent gave up on; running worker tasks poll it and stop
+        self.stopped_search = multiprocessing.Value('q', 0)
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.shared_bound, self.stopped_search))
+
+    def search_root(self, engine, state, depth, moves):
+        engine.search_depth = depth
+        engine.partial_best = None
+        # Workers only report their node counts; the rest of the statistics cover the root
+        engine.stats.expanded_nodes += 1
+        engine.stats.moves_searched += len(moves)
+        self.search_id += 1
+        self.shared_bound.value = -math.inf
+        wall_deadline = None
+        if engine.deadline is not None:
+            wall_deadline = time.time() + engine.deadline - time.perf_counter()
+
+        futures = [
+            self.executor.submit(_search_root_move, state, move, engine.ai_player, engine.tt_size, depth, wall_deadline, self.search_id)
+            for move in moves
+        ]
+
+        # Results are read in root order; the first move with the best exact score wins, as in the serial search
+        best_score = -math.inf
+        best_move = None
+        for move, future in zip(moves, futures):
+            result = None
+            nodes = 0
+            while not engine.out_of_time():
+                try:
+                    result, nodes = future.result(timeout=0.05)
+                    break
+                except TimeoutError:
+                    pass
+            engine.nodes += nodes
+            if result is None:
+                for pending in futures:
+                    pending.cancel()
+                self.stopped_search.value = self.search_id
+                # Tasks already running see the stop within a few hundred nodes; waiting for
+                # them leaves the pool idle for the next search, e.g. the turn after a ponder
+                wait(futures)
+                raise SearchTimeout()
+            score, exact = result
+            if exact and score > best_score:
+                best_score = score
+                best_move = move
+                engine.partial_best = best_move
+        return best_move
+
+    def close(self):
+        self.stopped_search.value = self.search_id
+        self.executor.shutdown(wait=False, cancel_futures=True)
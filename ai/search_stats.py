@@ -0,0 +1,76 @@
+import json
+import time
+
+class SearchStats:
+    def __init__(self, engine, board_size, ponder=False):
+        self.engine = engine
+        self.board_size = board_size
+        # Searched on the human's turn: elapsed is their think time, not the AI's
+        self.ponder = ponder
+        self.started = time.time()
+        self.elapsed = 0.0
+        self.best_move = None
+        self.completed_depth = 0
+        self.nodes = 0
+        self.leaf_evaluations = 0
+        # Interior nodes and the moves searched below them, for the branching factor
+        self.expanded_nodes = 0
+        self.moves_searched = 0
+        # Beta cutoffs by ply below the root
+        self.cutoffs = {}
+        # Set to None by engines without a transposition table
+        self.tt_probes = 0
+        self.tt_hits = 0
+        # (depth, seconds, nodes) per finished iteration
+        self.depth_times = []
+        self.principal_variation = []
+
+    def branching_factor(self):
+        return self.moves_searched / self.expanded_nodes if self.expanded_nodes else 0.0
+
+    def tt_hit_rate(self):
+        if not self.tt_probes:
+            return None
+        return self.tt_hits / self.tt_probes
+
+    def nodes_per_second(self):
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self):
+        return {
+            "engine": self.engine,
+            "board_size": self.board_size,
+            "ponder": self.ponder,
+            "started": self.started,
+            "elapsed": self.elapsed,
+            "best_move": list(self.best_move) if self.best_move else None,
+            "completed_depth": self.completed_depth,
+            "nodes": self.nodes,
+            "nodes_per_second": self.nodes_per_second(),
+            "leaf_evaluations": self.leaf_evaluations,
+            "branching_factor": self.branching_factor(),
+            "cutoffs_per_ply": {str(ply): count for ply, count in sorted(self.cutoffs.items())},
+            "tt_probes": self.tt_probes,
+            "tt_hits": self.tt_hits,
+            "tt_hit_rate": self.tt_hit_rate(),
+            "depth_times": [list(entry) for entry in self.depth_times],
+            "principal_variation": [list(move) for move in self.principal_variation],
+        }
+
+    def summary_lines(self):
+        # Short lines for the in-game debug overlay
+        lines = [
+            f"{self.engine}{' (ponder)' if self.ponder else ''}  depth {self.completed_depth}  {self.elapsed * 1000:.0f} ms",
+            f"nodes {self.nodes}  ({self.nodes_per_second():.0f}/s)  bf {self.branching_factor():.1f}",
+        ]
+        hit_rate = self.tt_hit_rate()
+        if hit_rate is not None:
+            lines.append(f"tt hits {hit_rate * 100:.0f}%  leaves {self.leaf_evaluations}")
+        if self.principal_variation:
+            lines.append("pv " + " ".join(f"{letter}{row},{col}" for row, col, letter in self.principal_variation[:6]))
+        return lines
+
+def append_stats_log(path, stats):
+    # One JSON object per line, so a log can be appended to from many games and read with any tool
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(stats.to_dict()) + "\n")
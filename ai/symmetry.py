@@ -0,0 +1,66 @@
+_BOARD_SYMMETRIES = {}
+
+def get_board_symmetries(board_size):
+    symmetries = _BOARD_SYMMETRIES.get(board_size)
+    if symmetries is None:
+        symmetries = BoardSymmetries(board_size)
+        _BOARD_SYMMETRIES[board_size] = symmetries
+    return symmetries
+
+class BoardSymmetries:
+    def __init__(self, board_size):
+        self.board_size = board_size
+        n = board_size - 1
+        # The eight elements of D4; the identity comes first
+        transforms = [
+            lambda r, c: (r, c),
+            lambda r, c: (c, n - r),
+            lambda r, c: (n - r, n - c),
+            lambda r, c: (n - c, r),
+            lambda r, c: (r, n - c),
+            lambda r, c: (n - r, c),
+            lambda r, c: (c, r),
+            lambda r, c: (n - c, n - r)
+        ]
+        # perms[g][cell] is the cell that `cell` moves to under symmetry g
+        self.perms = []
+        self.inverse_perms = []
+        for transform in transforms:
+            perm = []
+            for cell in range(board_size * board_size):
+                r, c = transform(*divmod(cell, board_size))
+                perm.append(r * board_size + c)
+            inverse = [0] * len(perm)
+            for cell, image in enumerate(perm):
+                inverse[image] = cell
+            self.perms.append(tuple(perm))
+            self.inverse_perms.append(tuple(inverse))
+
+    def transform_mask(self, mask, g):
+        perm = self.perms[g]
+        result = 0
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            result |= 1 << perm[bit.bit_length() - 1]
+        return result
+
+    def stabilizer(self, state):
+        # Symmetries that map the current board onto itself
+        return [g for g in range(8)
+                if self.transform_mask(state.o_mask, g) == state.o_mask
+                and self.transform_mask(state.s_mask, g) == state.s_mask]
+
+    def to_canonical(self, move, g):
+        if move is None:
+            return None
+        r, c, letter = move
+        r, c = divmod(self.perms[g][r * self.board_size + c], self.board_size)
+        return r, c, letter
+
+    def from_canonical(self, move, g):
+        if move is None:
+            return None
+        r, c, letter = move
+        r, c = divmod(self.inverse_perms[g][r * self.board_size + c], self.board_size)
+        return r, c, letter
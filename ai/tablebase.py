@@ -0,0 +1,130 @@
+import argparse
+import mmap
+import os
+import sys
+
+# File layout: an 8-byte header, then one signed byte per board in base-3 order (cell i adds
+# 3**i times 0 for empty, 1 for O, 2 for S). Each byte is the best net score the side to move
+# can still make from that board, which does not depend on the scores so far or on who moves.
+MAGIC = b"OSOTB1"
+HEADER_SIZE = 8
+# 3**25 bytes for 5x5 is far beyond any disk, so only boards up to 4x4 can be solved this way
+MAX_BOARD_SIZE = 4
+TABLEBASE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", "tablebases")
+
+_TABLEBASES = {}
+
+def tablebase_path(board_size):
+    return os.path.join(TABLEBASE_DIR, f"oso_{board_size}x{board_size}.bin")
+
+def get_tablebase(board_size):
+    # Opened (memory-mapped, not read) once per process; None when no file was generated
+    if board_size not in _TABLEBASES:
+        path = tablebase_path(board_size)
+        _TABLEBASES[board_size] = Tablebase(path) if os.path.exists(path) else None
+    return _TABLEBASES[board_size]
+
+class Tablebase:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a tablebase: {path}")
+        self.board_size = self.data[len(MAGIC)]
+        cells = self.board_size * self.board_size
+        self.powers = [3 ** cell for cell in range(cells)]
+        if len(self.data) != HEADER_SIZE + 3 ** cells:
+            raise ValueError(f"Truncated tablebase: {path}")
+
+    def board_index(self, state):
+        index = 0
+        for cell, power in enumerate(self.powers):
+            bit = 1 << cell
+            if state.o_mask & bit:
+                index += power
+            elif state.s_mask & bit:
+                index += 2 * power
+        return index
+
+    def value(self, index):
+        value = self.data[HEADER_SIZE + index]
+        return value - 256 if value > 127 else value
+
+    def move_value(self, state, index, move):
+        r, c, letter = move
+        cell = r * self.board_size + c
+        child_value = self.value(index + self.powers[cell] * (1 if letter == 'O' else 2))
+        points = state.move_points(r, c, letter)
+        # A scoring move keeps the turn, otherwise the opponent moves next
+        return points + child_value if points else -child_value
+
+    def best_move(self, state):
+        index = self.board_index(state)
+        best_value = None
+        best_move = None
+        for move in state.legal_moves():
+            value = self.move_value(state, index, move)
+            if best_value is None or value > best_value:
+                best_value = value
+                best_move = move
+        return best_move
+
+    def close(self):
+        self.data.close()
+
+def generate(board_size, path=None, progress=None, chunk_size=1 << 18):
+    # Boards are solved in batches by number of empty cells: a move fills one cell, so every
+    # board a batch can lead to was solved with the batch before
+    import numpy as np
+    from game.batch_scoring import EMPTY, boards_from_indexes, move_deltas
+    if board_size > MAX_BOARD_SIZE:
+        raise ValueError(f"Boards larger than {MAX_BOARD_SIZE}x{MAX_BOARD_SIZE} are too large to solve exhaustively")
+    path = path or tablebase_path(board_size)
+    cells = board_size * board_size
+    total = 3 ** cells
+    powers = 3 ** np.arange(cells, dtype=np.int64)
+    values = np.zeros(total, dtype=np.int8)
+
+    # Empty cells of every index: each extra digit repeats the counts three times, plus one
+    # where that digit is 0
+    empty_counts = np.zeros(1, dtype=np.int8)
+    for _ in range(cells):
+        empty_counts = np.concatenate((empty_counts + 1, empty_counts, empty_counts))
+
+    done = total - np.count_nonzero(empty_counts)
+    for empty_count in range(1, cells + 1):
+        layer = np.flatnonzero(empty_counts == empty_count)
+        for start in range(0, len(layer), chunk_size):
+            indexes = layer[start:start + chunk_size]
+            boards = boards_from_indexes(indexes, board_size)
+            empty = boards.reshape(len(indexes), cells) == EMPTY
+            deltas = move_deltas(boards).reshape(len(indexes), 2, cells).astype(np.int16)
+            best = np.full(len(indexes), -128, dtype=np.int16)
+            for letter in range(2):
+                children = np.where(empty, indexes[:, None] + powers * (letter + 1), 0)
+                child_values = values[children].astype(np.int16)
+                points = deltas[:, letter]
+                # A scoring move keeps the turn, otherwise the opponent moves next
+                move_values = np.where(points > 0, points + child_values, -child_values)
+                best = np.maximum(best, np.where(empty, move_values, -128).max(axis=1))
+            values[indexes] = best
+            done += len(indexes)
+            if progress:
+                progress(done, total)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + bytes([board_size]) + bytes(HEADER_SIZE - len(MAGIC) - 1))
+        f.write(values.tobytes())
+    os.replace(tmp_path, path)
+    return path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve every OSO board of the given sizes and write the tablebases.")
+    parser.add_argument("sizes", nargs="*", type=int, default=[4])
+    args = parser.parse_args()
+    for size in args.sizes:
+        written = generate(size, progress=lambda done, total: print(f"{size}x{size}: {done}/{total}", file=sys.stderr))
+        print(written)
@@ -0,0 +1,31 @@
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+class TranspositionTable:
+    def __init__(self, size=262144):
+        self.size = size
+        # Each slot holds (key, depth, value, flag, best move, generation) or None
+        self.entries = [None] * size
+        self.generation = 0
+
+    def new_search(self):
+        self.generation += 1
+
+    def clear(self):
+        self.entries = [None] * self.size
+        self.generation = 0
+
+    def probe(self, key):
+        entry = self.entries[key % self.size]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key, depth, value, flag, move):
+        index = key % self.size
+        entry = self.entries[index]
+        # Depth-preferred: a deeper entry from the current search is only replaced by one at least as deep
+        if entry is not None and entry[5] == self.generation and entry[1] > depth:
+            return
+        self.entries[index] = (key, depth, value, flag, move, self.generation)
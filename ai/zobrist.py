@@ -0,0 +1,50 @@
+import random
+from ai.symmetry import get_board_symmetries
+
+_ZOBRIST_KEYS = {}
+
+def get_zobrist_keys(board_size):
+    keys = _ZOBRIST_KEYS.get(board_size)
+    if keys is None:
+        keys = ZobristKeys(board_size)
+        _ZOBRIST_KEYS[board_size] = keys
+    return keys
+
+class ZobristKeys:
+    def __init__(self, board_size):
+        self.board_size = board_size
+        cells = board_size * board_size
+        # Fixed seed so every process builds the same keys for a board size
+        rng = random.Random(board_size)
+        self.o_keys = [rng.getrandbits(64) for _ in range(cells)]
+        self.s_keys = [rng.getrandbits(64) for _ in range(cells)]
+        self.player_keys = {1: rng.getrandbits(64), 2: rng.getrandbits(64)}
+        # A board has fewer than four triples per cell, which bounds any score difference
+        self.diff_offset = 4 * cells
+        self.diff_keys = [rng.getrandbits(64) for _ in range(2 * self.diff_offset + 1)]
+
+        # Keys of each (cell, letter) seen through the eight board symmetries, so a search can
+        # keep the hash of every orientation of the board up to date with one XOR each
+        symmetries = get_board_symmetries(board_size)
+        self.symmetric_o_keys = [tuple(self.o_keys[perm[cell]] for perm in symmetries.perms) for cell in range(cells)]
+        self.symmetric_s_keys = [tuple(self.s_keys[perm[cell]] for perm in symmetries.perms) for cell in range(cells)]
+
+    def symmetric_letter_keys(self, cell, letter):
+        return self.symmetric_o_keys[cell] if letter == 'O' else self.symmetric_s_keys[cell]
+
+    def hash_board_symmetries(self, state):
+        hashes = [0] * 8
+        for cell in range(self.board_size * self.board_size):
+            bit = 1 << cell
+            if state.o_mask & bit:
+                keys = self.symmetric_o_keys[cell]
+            elif state.s_mask & bit:
+                keys = self.symmetric_s_keys[cell]
+            else:
+                continue
+            hashes = [h ^ k for h, k in zip(hashes, keys)]
+        return tuple(hashes)
+
+    def position_key(self, board_hash, state):
+        diff = state.players_points[1] - state.players_points[2]
+        return board_hash ^ self.player_keys[state.current_player] ^ self.diff_keys[diff + self.diff_offset]
@@ -0,0 +1,167 @@
+import argparse
+import copy
+import json
+import os
+import random
+import sys
+import time
+from ai.ai_manager import AIManager
+from game.game_manager import GameManager
+import settings.settings_manager as settings_manager
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+# Fraction of the filled cells for each benchmark position, and the seed that fills them
+PHASES = {"empty": 0.0, "midgame": 0.4, "endgame": 0.8}
+POSITION_SEED = 1234
+DEFAULT_TOLERANCE = 0.10
+# Work per timed run of the cheap benchmarks, so each run takes long enough to time reliably
+BOARD_FILLS = 200
+POINT_COUNT_ROUNDS = 200
+
+def benchmark_position(board_size, phase):
+    game = GameManager(board_size)
+    rng = random.Random(POSITION_SEED + board_size)
+    for _ in range(int(board_size * board_size * PHASES[phase])):
+        row, col = rng.choice(list(game.empty_cells()))
+        game.apply_move(row, col, rng.choice('OS'))
+    return game
+
+def search_depth(board_size):
+    # Deep enough to exercise the search, shallow enough to keep the whole suite short
+    if board_size >= 7:
+        return 2
+    if board_size >= 5:
+        return 3
+    return 4
+
+def perft(game, depth):
+    if depth == 0 or game.is_full():
+        return 1
+    total = 0
+    for move in list(game.legal_moves()):
+        game.apply_move(*move)
+        total += perft(game, depth - 1)
+        game.undo_move()
+    return total
+
+def best_time(function, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def bench_place_letter(board_size, repeat):
+    # Fills empty boards cell by cell, alternating letters
+    def fill():
+        letters = ('O', 'S')
+        calls = 0
+        for _ in range(BOARD_FILLS):
+            game = GameManager(board_size)
+            for row in range(board_size):
+                for col in range(board_size):
+                    game.set_selected_letter(letters[(row + col) % 2])
+                    game.place_letter(row, col)
+                    calls += 1
+        return calls
+    elapsed, calls = best_time(fill, repeat)
+    return {"calls_per_second": calls / elapsed}
+
+def bench_count_oso_points(game, repeat):
+    occupied = [(row, col) for row in range(game.board_size) for col in range(game.board_size) if not game.is_empty(row, col)]
+    def count():
+        for _ in range(POINT_COUNT_ROUNDS):
+            for row, col in occupied:
+                game.count_oso_points(row, col)
+        return POINT_COUNT_ROUNDS * len(occupied)
+    elapsed, calls = best_time(count, repeat)
+    return {"calls_per_second": calls / elapsed if calls else 0}
+
+def bench_perft(game, depth, repeat):
+    elapsed, leaves = best_time(lambda: perft(game, depth), repeat)
+    return {"depth": depth, "leaves": leaves, "leaves_per_second": leaves / elapsed}
+
+def bench_best_move(game, depth, repeat):
+    # A fresh engine for every run, so each search starts from an empty table
+    def search():
+        engine = AIManager(game, use_tablebase=False)
+        engine.max_depth = depth
+        move = engine.best_move()
+        return move, engine.nodes
+    elapsed, (move, nodes) = best_time(search, repeat)
+    return {"depth": depth, "move": list(move) if move else None, "nodes": nodes,
+            "latency_ms": elapsed * 1000, "nodes_per_second": nodes / elapsed}
+
+def run_benchmarks(board_sizes, repeat=5, progress=None):
+    results = {}
+    for board_size in board_sizes:
+        size_results = {"place_letter": bench_place_letter(board_size, repeat)}
+        for phase in PHASES:
+            if progress:
+                progress(f"{board_size}x{board_size} {phase}")
+            game = benchmark_position(board_size, phase)
+            size_results[phase] = {
+                "count_oso_points": bench_count_oso_points(copy.deepcopy(game), repeat),
+                "perft": bench_perft(copy.deepcopy(game), 2, repeat),
+                "best_move": bench_best_move(copy.deepcopy(game), search_depth(board_size), repeat),
+            }
+        results[str(board_size)] = size_results
+    return results
+
+# Timings regress when they get worse by more than the tolerance; counts and chosen moves are
+# fixed by the positions and depths, so any difference in them is reported as a change
+THROUGHPUT_METRICS = ("calls_per_second", "leaves_per_second", "nodes_per_second")
+LATENCY_METRICS = ("latency_ms",)
+EXACT_METRICS = ("leaves", "nodes", "move")
+
+def compare(baseline, current, tolerance=DEFAULT_TOLERANCE):
+    regressions = []
+    changes = []
+
+    def walk(base, new, path):
+        for key, base_value in base.items():
+            if key not in new:
+                continue
+            new_value = new[key]
+            name = f"{path}.{key}" if path else key
+            if isinstance(base_value, dict):
+                walk(base_value, new_value, name)
+            elif key in THROUGHPUT_METRICS and new_value < base_value * (1 - tolerance):
+                regressions.append({"metric": name, "baseline": base_value, "current": new_value})
+            elif key in LATENCY_METRICS and new_value > base_value * (1 + tolerance):
+                regressions.append({"metric": name, "baseline": base_value, "current": new_value})
+            elif key in EXACT_METRICS and new_value != base_value:
+                changes.append({"metric": name, "baseline": base_value, "current": new_value})
+
+    walk(baseline, current, "")
+    return regressions, changes
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the game and the search on fixed positions.")
+    parser.add_argument("--sizes", nargs="*", type=int, default=None, help="board sizes (default: the ones in settings.json)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark; the fastest one counts")
+    parser.add_argument("--save", nargs="?", const=BASELINE_PATH, help="write the results as the new baseline")
+    parser.add_argument("--compare", nargs="?", const=BASELINE_PATH, help="compare the results with a baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown before a timing counts as a regression")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    board_sizes = args.sizes or settings_manager.get_board_sizes()
+    results = run_benchmarks(board_sizes, args.repeat, progress=lambda name: print(name, file=sys.stderr))
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+    if baseline is None:
+        print(json.dumps(results, indent=4))
+        sys.exit(0)
+
+    regressions, changes = compare(baseline, results, args.tolerance)
+    print(json.dumps({"regressions": regressions, "changed_results": changes}, indent=4))
+    sys.exit(1 if regressions else 0)
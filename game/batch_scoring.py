@@ -0,0 +1,63 @@
+import numpy as np
+
+# Boards are int8 arrays of shape (N, board_size, board_size), the same 0/1/2 cell codes the
+# tablebase uses for its base-3 indexes
+EMPTY = 0
+LETTER_O = 1
+LETTER_S = 2
+
+def boards_from_states(states):
+    size = states[0].board_size
+    cells = size * size
+    n_bytes = (cells + 7) // 8
+    boards = np.zeros((len(states), cells), dtype=np.int8)
+    for i, state in enumerate(states):
+        o_bits = np.unpackbits(np.frombuffer(state.o_mask.to_bytes(n_bytes, "little"), dtype=np.uint8), bitorder="little")[:cells]
+        s_bits = np.unpackbits(np.frombuffer(state.s_mask.to_bytes(n_bytes, "little"), dtype=np.uint8), bitorder="little")[:cells]
+        boards[i] = o_bits * LETTER_O + s_bits * LETTER_S
+    return boards.reshape(len(states), size, size)
+
+def boards_from_indexes(indexes, board_size):
+    # Digit i of a base-3 index is the code of cell i
+    cells = board_size * board_size
+    powers = 3 ** np.arange(cells, dtype=np.int64)
+    digits = (np.asarray(indexes, dtype=np.int64)[:, None] // powers) % 3
+    return digits.astype(np.int8).reshape(-1, board_size, board_size)
+
+def line_windows(array):
+    # (first, middle, last) views of every line of three cells, one triple of views per direction
+    return (
+        (array[:, :, :-2], array[:, :, 1:-1], array[:, :, 2:]),
+        (array[:, :-2, :], array[:, 1:-1, :], array[:, 2:, :]),
+        (array[:, :-2, :-2], array[:, 1:-1, 1:-1], array[:, 2:, 2:]),
+        (array[:, :-2, 2:], array[:, 1:-1, 1:-1], array[:, 2:, :-2]),
+    )
+
+def oso_counts(boards):
+    counts = np.zeros(len(boards), dtype=np.int32)
+    for first, middle, last in line_windows(boards):
+        counts += ((first == LETTER_O) & (middle == LETTER_S) & (last == LETTER_O)).sum(axis=(1, 2))
+    return counts
+
+def move_deltas(boards):
+    # Points for each (letter, cell) move, shape (N, 2, board_size, board_size) with O first;
+    # occupied cells score 0
+    n, size, _ = boards.shape
+    deltas = np.zeros((n, 2, size, size), dtype=np.int8)
+    is_o = boards == LETTER_O
+    is_s = boards == LETTER_S
+    is_empty = boards == EMPTY
+    o_deltas = deltas[:, 0]
+    s_deltas = deltas[:, 1]
+    for (o_first, o_middle, o_last), (s_first, s_middle, s_last), (e_first, e_middle, e_last), (d_first, _, d_last), (_, d_middle, _) in zip(
+            line_windows(is_o), line_windows(is_s), line_windows(is_empty), line_windows(o_deltas), line_windows(s_deltas)):
+        d_first += e_first & s_middle & o_last
+        d_last += o_first & s_middle & e_last
+        d_middle += o_first & e_middle & o_last
+    return deltas
+
+def evaluate(points, ai_player):
+    # `points` has one row per position with the scores of players 1 and 2
+    points = np.asarray(points)
+    human_player = 1 if ai_player == 2 else 2
+    return points[:, ai_player - 1] - points[:, human_player - 1]
@@ -1,13 +1,189 @@
+_TRIPLE_INDEXES = {}
+
+def get_triple_index(board_size):
+    index = _TRIPLE_INDEXES.get(board_size)
+    if index is None:
+        index = TripleIndex(board_size)
+        _TRIPLE_INDEXES[board_size] = index
+    return index
+
+class TripleIndex:
+    def __init__(self, board_size):
+        self.board_size = board_size
+        cells = board_size * board_size
+        # Every line of three cells on the board, as (end, middle, end) cell indexes
+        self.triples = []
+        directions = [
+            (0, 1),
+            (1, 0),
+            (1, 1),
+            (1, -1)
+        ]
+        for r0 in range(board_size):
+            for c0 in range(board_size):
+                for dr, dc in directions:
+                    r2 = r0 + 2 * dr
+                    c2 = c0 + 2 * dc
+                    if 0 <= r2 < board_size and 0 <= c2 < board_size:
+                        self.triples.append((r0 * board_size + c0, (r0 + dr) * board_size + c0 + dc, r2 * board_size + c2))
+
+        # Per cell: (triple id, position 0/1/2) for every triple through it
+        cell_triples = [[] for _ in range(cells)]
+        # Per cell: (ends mask, middle mask) of the triples an O or an S placed there can complete
+        o_masks = [[] for _ in range(cells)]
+        s_masks = [[] for _ in range(cells)]
+        for triple_id, (a, b, c) in enumerate(self.triples):
+            ends = (1 << a) | (1 << c)
+            middle = 1 << b
+            for position, cell in enumerate((a, b, c)):
+                cell_triples[cell].append((triple_id, position))
+            o_masks[a].append((ends, middle))
+            o_masks[c].append((ends, middle))
+            s_masks[b].append((ends, middle))
+
+        self.cell_triples = [tuple(entries) for entries in cell_triples]
+        self.o_masks = [tuple(entries) for entries in o_masks]
+        self.s_masks = [tuple(entries) for entries in s_masks]
+
+        # Whole-board neighbour lookups for scoring_cells(): (shift, mask) pairs that move the
+        # letter one or two steps away in a direction onto each cell that has such a neighbour
+        self.o_scoring_shifts = []
+        self.s_scoring_shifts = []
+        for dr, dc in directions + [(-dr, -dc) for dr, dc in directions]:
+            self.o_scoring_shifts.append(self.neighbour_shift(dr, dc) + self.neighbour_shift(2 * dr, 2 * dc))
+        for dr, dc in directions:
+            self.s_scoring_shifts.append(self.neighbour_shift(dr, dc) + self.neighbour_shift(-dr, -dc))
+
+    def neighbour_shift(self, dr, dc):
+        size = self.board_size
+        valid = 0
+        for r in range(size):
+            for c in range(size):
+                if 0 <= r + dr < size and 0 <= c + dc < size:
+                    valid |= 1 << (r * size + c)
+        return dr * size + dc, valid
+
+    def letter_points(self, o_mask, s_mask, cell, letter):
+        # Points for putting `letter` on the empty `cell` of the board given by the two masks
+        bit = 1 << cell
+        total_points = 0
+        if letter == 'O':
+            for ends, middle in self.o_masks[cell]:
+                if o_mask & (ends & ~bit) and s_mask & middle:
+                    total_points += 1
+        else:
+            for ends, middle in self.s_masks[cell]:
+                if o_mask & ends == ends:
+                    total_points += 1
+        return total_points
+
+    def scoring_cells(self, o_mask, s_mask, occupied):
+        o_cells = 0
+        s_cells = 0
+        for shift1, valid1, shift2, valid2 in self.o_scoring_shifts:
+            s_near = (s_mask >> shift1 if shift1 > 0 else s_mask << -shift1) & valid1
+            o_far = (o_mask >> shift2 if shift2 > 0 else o_mask << -shift2) & valid2
+            o_cells |= s_near & o_far
+        for shift1, valid1, shift2, valid2 in self.s_scoring_shifts:
+            o_ahead = (o_mask >> shift1 if shift1 > 0 else o_mask << -shift1) & valid1
+            o_behind = (o_mask >> shift2 if shift2 > 0 else o_mask << -shift2) & valid2
+            s_cells |= o_ahead & o_behind
+        empty = ~occupied
+        return o_cells & empty, s_cells & empty
+
+    def giveaway_cells(self, o_mask, s_mask, occupied):
+        # Masks of the empty cells where an O, or an S, would let the next player complete an OSO
+        empty_mask = ~occupied
+        o_cells = 0
+        s_cells = 0
+        for shift1, valid1, shift2, valid2 in self.o_scoring_shifts:
+            s_near = (s_mask >> shift1 if shift1 > 0 else s_mask << -shift1) & valid1
+            o_far = (o_mask >> shift2 if shift2 > 0 else o_mask << -shift2) & valid2
+            empty_near = (empty_mask >> shift1 if shift1 > 0 else empty_mask << -shift1) & valid1
+            empty_far = (empty_mask >> shift2 if shift2 > 0 else empty_mask << -shift2) & valid2
+            o_cells |= (s_near & empty_far) | (empty_near & o_far)
+        for shift1, valid1, shift2, valid2 in self.s_scoring_shifts:
+            o_ahead = (o_mask >> shift1 if shift1 > 0 else o_mask << -shift1) & valid1
+            o_behind = (o_mask >> shift2 if shift2 > 0 else o_mask << -shift2) & valid2
+            empty_ahead = (empty_mask >> shift1 if shift1 > 0 else empty_mask << -shift1) & valid1
+            empty_behind = (empty_mask >> shift2 if shift2 > 0 else empty_mask << -shift2) & valid2
+            s_cells |= (o_ahead & empty_behind) | (empty_ahead & o_behind)
+        return o_cells & empty_mask, s_cells & empty_mask
+
 class GameManager:
     def __init__(self, board_size=5):
         self.board_size = board_size
-        self.board = [['' for _ in range(board_size)] for _ in range(board_size)]
+        self.triple_index = get_triple_index(board_size)
+        # Bitboards: bit (row * board_size + col) is set when the cell holds that letter
+        self.o_mask = 0
+        self.s_mask = 0
+        self.occupied = 0
+        # Empty cells as a doubly linked list in raster order; index `cells` is the list head
+        cells = board_size * board_size
+        self.empty_count = cells
+        self.next_empty = list(range(1, cells + 1)) + [0]
+        self.prev_empty = [cells] + list(range(cells))
         self.current_player = 1
         self.players_points = {1: 0, 2: 0}
         self.selected_letter = 'S'
+        self.move_history = []
+
+    def __getstate__(self):
+        # The triple index is shared per board size; look it up again instead of copying it
+        state = self.__dict__.copy()
+        del state['triple_index']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.triple_index = get_triple_index(self.board_size)
+
+    @property
+    def board(self):
+        return self.get_board()
 
     def get_board(self):
-        return self.board
+        board = []
+        bit = 1
+        for _ in range(self.board_size):
+            row = []
+            for _ in range(self.board_size):
+                if self.o_mask & bit:
+                    row.append('O')
+                elif self.s_mask & bit:
+                    row.append('S')
+                else:
+                    row.append('')
+                bit <<= 1
+            board.append(row)
+        return board
+
+    def get_cell(self, row, col):
+        bit = 1 << (row * self.board_size + col)
+        if self.o_mask & bit:
+            return 'O'
+        if self.s_mask & bit:
+            return 'S'
+        return ''
+
+    def is_empty(self, row, col):
+        return not self.occupied & (1 << (row * self.board_size + col))
+
+    def empty_cells(self):
+        head = self.board_size * self.board_size
+        cell = self.next_empty[head]
+        while cell != head:
+            yield divmod(cell, self.board_size)
+            cell = self.next_empty[cell]
+
+    def legal_moves(self):
+        head = self.board_size * self.board_size
+        cell = self.next_empty[head]
+        while cell != head:
+            row, col = divmod(cell, self.board_size)
+            yield row, col, 'O'
+            yield row, col, 'S'
+            cell = self.next_empty[cell]
 
     def set_selected_letter(self, letter):
         self.selected_letter = letter
@@ -18,10 +194,24 @@ class GameManager:
     def place_letter(self, row, col):
         if not (0 <= row < self.board_size and 0 <= col < self.board_size):
             return False, 0
-        if self.board[row][col] != '':
+        cell = row * self.board_size + col
+        bit = 1 << cell
+        if self.occupied & bit:
             return False, 0
 
-        self.board[row][col] = self.selected_letter
+        if self.selected_letter == 'O':
+            self.o_mask |= bit
+        elif self.selected_letter == 'S':
+            self.s_mask |= bit
+        else:
+            return False, 0
+        self.occupied |= bit
+        prev_cell = self.prev_empty[cell]
+        next_cell = self.next_empty[cell]
+        self.next_empty[prev_cell] = next_cell
+        self.prev_empty[next_cell] = prev_cell
+        self.empty_count -= 1
+
         puntos = self.count_oso_points(row, col)
         self.players_points[self.current_player] += puntos
 
@@ -29,30 +219,57 @@ class GameManager:
             self.current_player = 2 if self.current_player == 1 else 1
         return True, puntos
 
+    def apply_move(self, row, col, letter):
+        previous_letter = self.selected_letter
+        player = self.current_player
+        self.selected_letter = letter
+        valid, puntos = self.place_letter(row, col)
+        if not valid:
+            self.selected_letter = previous_letter
+            return False, 0
+        self.move_history.append((row, col, player, previous_letter, puntos))
+        return True, puntos
+
+    def undo_move(self):
+        row, col, player, previous_letter, puntos = self.move_history.pop()
+        cell = row * self.board_size + col
+        bit = 1 << cell
+        self.o_mask &= ~bit
+        self.s_mask &= ~bit
+        self.occupied &= ~bit
+        # Moves are undone in reverse order, so the cell's own links still point at its neighbours
+        self.next_empty[self.prev_empty[cell]] = cell
+        self.prev_empty[self.next_empty[cell]] = cell
+        self.empty_count += 1
+        self.players_points[player] -= puntos
+        self.current_player = player
+        self.selected_letter = previous_letter
+
     def count_oso_points(self, row, col):
+        cell = row * self.board_size + col
+        bit = 1 << cell
+        o_mask = self.o_mask
+        s_mask = self.s_mask
         total_points = 0
-        directions = [
-            (0, 1),
-            (1, 0),
-            (1, 1),
-            (1, -1)
-        ]
-        for dr, dc in directions:
-            for start in range(-2, 1):
-                r0 = row + start * dr
-                c0 = col + start * dc
-                r1 = r0 + dr
-                c1 = c0 + dc
-                r2 = r0 + 2 * dr
-                c2 = c0 + 2 * dc
-                if all(0 <= x < self.board_size for x in (r0, r1, r2)) and all(0 <= y < self.board_size for y in (c0, c1, c2)):
-                    seq = [self.board[r0][c0], self.board[r1][c1], self.board[r2][c2]]
-                    if seq == ['O', 'S', 'O']:
-                        total_points += 1
+        if o_mask & bit:
+            for ends, middle in self.triple_index.o_masks[cell]:
+                if o_mask & ends == ends and s_mask & middle:
+                    total_points += 1
+        elif s_mask & bit:
+            for ends, middle in self.triple_index.s_masks[cell]:
+                if o_mask & ends == ends:
+                    total_points += 1
         return total_points
 
+    def move_points(self, row, col, letter):
+        return self.triple_index.letter_points(self.o_mask, self.s_mask, row * self.board_size + col, letter)
+
+    def scoring_cells(self):
+        # Masks of the empty cells where an O, or an S, would complete at least one OSO
+        return self.triple_index.scoring_cells(self.o_mask, self.s_mask, self.occupied)
+
     def is_full(self):
-        return all(cell != '' for row in self.board for cell in row)
+        return self.empty_count == 0
 
     def get_winner(self):
         p1 = self.players_points[1]
@@ -68,4 +285,4 @@ class GameManager:
         return self.current_player
 
     def get_player_points(self, player):
-        return self.players_points.get(player, 0)
\ No newline at end of file
+        return self.players_points.get(player, 0)
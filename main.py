@@ -1,46 +1,80 @@
+import atexit
 import pygame
 import sys
+from screens.frame_profiler import FrameProfiler
 from screens.screen_manager import ScreenManager
 from screens.screen_menu import ScreenMenu
 import settings.settings_manager
 
-pygame.init()
-
-settings.settings_manager.ensure_max_resolution()
-
-icon = pygame.image.load("assets/images/icon.png")
-pygame.display.set_icon(icon)
-pygame.display.set_caption("OSO-GAME")
-
-# Load settings
-resolution = settings.settings_manager.get_current_resolution()
-opponent = settings.settings_manager.get_current_opponent()
-board_size = settings.settings_manager.get_current_board_size()
-language = settings.settings_manager.get_current_language()
-screen =  ScreenManager.create_screen(resolution)
-clock = pygame.time.Clock()
-
-# Screen menu
-manager = ScreenManager()
-screen_menu = ScreenMenu(resolution, opponent, board_size, language, manager)
-manager.set_screen(screen_menu)
-
-# Game Loop
-while True:
-    events = pygame.event.get()
-
-    for event in events:
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
-        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-            pygame.quit()
-            sys.exit()
-
-    # Events
-    manager.handle_events(events)
-    manager.update()
-    manager.draw(screen)
-
-    pygame.display.flip()
-    clock.tick(60)
\ No newline at end of file
+# Longest sleep while idle, so the screen still gets a frame now and then without input
+IDLE_WAIT_MS = 1000
+
+def main():
+    pygame.init()
+
+    # Opt-in frame profiling (--profile or OSO_PROFILE=1); the summary is written on exit
+    profiler = FrameProfiler.from_environment()
+    atexit.register(profiler.write_summary)
+
+    settings.settings_manager.ensure_max_resolution()
+
+    icon = pygame.image.load("assets/images/icon.png")
+    pygame.display.set_icon(icon)
+    pygame.display.set_caption("OSO-GAME")
+
+    # Load settings
+    resolution = settings.settings_manager.get_current_resolution()
+    opponent = settings.settings_manager.get_current_opponent()
+    board_size = settings.settings_manager.get_current_board_size()
+    language = settings.settings_manager.get_current_language()
+    screen = ScreenManager.create_screen(resolution)
+    clock = pygame.time.Clock()
+
+    # Screen menu
+    manager = ScreenManager()
+    screen_menu = ScreenMenu(resolution, opponent, board_size, language, manager)
+    manager.set_screen(screen_menu)
+
+    # Game Loop
+    while True:
+        # Nothing on screen moves: sleep until an event arrives instead of drawing 60 same frames
+        waited_events = []
+        if not manager.needs_animation():
+            event = pygame.event.wait(IDLE_WAIT_MS)
+            if event.type != pygame.NOEVENT:
+                waited_events.append(event)
+
+        profiler.begin_frame(manager.current_screen)
+        with profiler.phase("events"):
+            events = waited_events + pygame.event.get()
+
+            for event in events:
+                if event.type == pygame.QUIT:
+                    manager.shutdown()
+                    pygame.quit()
+                    sys.exit()
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    if not manager.handle_escape():
+                        manager.shutdown()
+                        pygame.quit()
+                        sys.exit()
+
+            # Events
+            manager.handle_events(events)
+        with profiler.phase("update"):
+            manager.update()
+        with profiler.phase("draw"):
+            dirty_rects = manager.draw(screen)
+
+        with profiler.phase("flip"):
+            if dirty_rects is None:
+                pygame.display.flip()
+            elif dirty_rects:
+                pygame.display.update(dirty_rects)
+        profiler.end_frame(any(event.type in (pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN) for event in events))
+        clock.tick(60)
+
+# Process pools on Windows and macOS start workers by importing this module again; the guard
+# keeps them from opening a window of their own
+if __name__ == "__main__":
+    main()
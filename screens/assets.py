@@ -0,0 +1,59 @@
+import json
+import os
+import pygame
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+IMAGES_DIR = os.path.join(BASE_DIR, "assets", "images")
+LANGUAGES_PATH = os.path.join(BASE_DIR, "languages", "languages.json")
+
+_ASSETS = None
+
+def get_assets():
+    global _ASSETS
+    if _ASSETS is None:
+        _ASSETS = AssetRegistry()
+    return _ASSETS
+
+class AssetRegistry:
+    # Images, their scaled copies, fonts and translations, each loaded once per process.
+    # Surfaces are shared between screens: callers blit them and must not draw on them.
+    def __init__(self):
+        self.images = {}
+        self.scaled_images = {}
+        self.fonts = {}
+        self.translation_tables = None
+
+    def image(self, name, alpha=True):
+        key = (name, alpha)
+        image = self.images.get(key)
+        if image is not None:
+            return image
+        image = pygame.image.load(os.path.join(IMAGES_DIR, name))
+        # convert() needs a display mode; until there is one the image is loaded but not kept
+        if pygame.display.get_surface() is None:
+            return image
+        image = image.convert_alpha() if alpha else image.convert()
+        self.images[key] = image
+        return image
+
+    def scaled_image(self, name, size, alpha=True):
+        # One copy per size, so each resolution scales the image once
+        key = (name, tuple(size), alpha)
+        image = self.scaled_images.get(key)
+        if image is None:
+            image = pygame.transform.smoothscale(self.image(name, alpha), tuple(size))
+            self.scaled_images[key] = image
+        return image
+
+    def font(self, name, size):
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = pygame.font.SysFont(name, size)
+        return font
+
+    def translations(self):
+        if self.translation_tables is None:
+            with open(LANGUAGES_PATH, "r", encoding="utf-8") as f:
+                self.translation_tables = json.load(f)
+        return self.translation_tables
@@ -0,0 +1,175 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import time
+
+FRAME_BUDGET_MS = 1000 / 60
+# Upper edges (ms) of the frame-time histogram buckets; the last bucket takes everything slower
+HISTOGRAM_EDGES = (4, 8, 12, 16.7, 25, 33.3, 50, 100)
+SLOWEST_FRAMES_KEPT = 10
+
+class PhaseTimer:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        profiler = self.profiler
+        if profiler.cprofile is not None and self.name == profiler.cprofile_section:
+            profiler.cprofile.enable()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        profiler = self.profiler
+        elapsed = (time.perf_counter() - self.start) * 1000
+        if profiler.cprofile is not None and self.name == profiler.cprofile_section:
+            profiler.cprofile.disable()
+        profiler.frame_phases[self.name] = profiler.frame_phases.get(self.name, 0.0) + elapsed
+        return False
+
+class NullPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+NULL_PHASE = NullPhase()
+
+class ScreenFrameStats:
+    def __init__(self):
+        self.frames = 0
+        self.dropped_frames = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.histogram = [0] * (len(HISTOGRAM_EDGES) + 1)
+        self.phase_totals = {}
+        self.phase_max = {}
+        self.input_frames = 0
+        self.input_latency_total_ms = 0.0
+        self.input_latency_max_ms = 0.0
+
+    def to_dict(self):
+        lower_edges = (0,) + HISTOGRAM_EDGES
+        labels = [f"{low}-{high}ms" for low, high in zip(lower_edges, HISTOGRAM_EDGES)] + [f"{HISTOGRAM_EDGES[-1]}ms+"]
+        return {
+            "frames": self.frames,
+            "dropped_frames": self.dropped_frames,
+            "average_ms": self.total_ms / self.frames if self.frames else 0.0,
+            "max_ms": self.max_ms,
+            "histogram": dict(zip(labels, self.histogram)),
+            "phases": {
+                name: {"average_ms": total / self.frames, "max_ms": self.phase_max[name]}
+                for name, total in self.phase_totals.items()
+            },
+            "input_frames": self.input_frames,
+            "average_input_latency_ms": self.input_latency_total_ms / self.input_frames if self.input_frames else 0.0,
+            "max_input_latency_ms": self.input_latency_max_ms,
+        }
+
+class FrameProfiler:
+    # Times the phases of every frame of the game loop, per screen. Disabled, every call returns
+    # at once, so the loop can always go through it.
+    def __init__(self, enabled=False, output_path=None, cprofile_section=None):
+        self.enabled = enabled
+        self.output_path = output_path
+        self.cprofile_section = cprofile_section
+        self.cprofile = cProfile.Profile() if enabled and cprofile_section else None
+        self.screens = {}
+        self.slowest_frames = []
+        self.frame_screen = None
+        self.frame_phases = {}
+        self.frame_start = 0.0
+        self.frame_index = 0
+
+    @classmethod
+    def from_environment(cls, argv=None):
+        # `--profile` or OSO_PROFILE=1 turns it on; `--profile-section NAME` or
+        # OSO_PROFILE_SECTION=NAME runs cProfile around one phase; OSO_PROFILE_OUTPUT names the
+        # JSON summary written on exit
+        argv = sys.argv[1:] if argv is None else argv
+        enabled = "--profile" in argv or os.environ.get("OSO_PROFILE", "") not in ("", "0")
+        section = os.environ.get("OSO_PROFILE_SECTION")
+        if "--profile-section" in argv:
+            position = argv.index("--profile-section")
+            if position + 1 < len(argv):
+                section = argv[position + 1]
+                enabled = True
+        return cls(enabled, os.environ.get("OSO_PROFILE_OUTPUT", "frame_profile.json"), section)
+
+    def begin_frame(self, screen):
+        if not self.enabled:
+            return
+        self.frame_screen = type(screen).__name__ if screen is not None else "None"
+        self.frame_phases = {}
+        self.frame_start = time.perf_counter()
+
+    def phase(self, name):
+        if not self.enabled:
+            return NULL_PHASE
+        return PhaseTimer(self, name)
+
+    def end_frame(self, had_input=False):
+        # Frame time is the work done before the frame is shown, without the wait for the next
+        # tick; frames with input also count as the latency from reading it to showing the result
+        if not self.enabled:
+            return
+        frame_ms = (time.perf_counter() - self.frame_start) * 1000
+        stats = self.screens.get(self.frame_screen)
+        if stats is None:
+            stats = self.screens[self.frame_screen] = ScreenFrameStats()
+        stats.frames += 1
+        stats.total_ms += frame_ms
+        stats.max_ms = max(stats.max_ms, frame_ms)
+        bucket = 0
+        while bucket < len(HISTOGRAM_EDGES) and frame_ms >= HISTOGRAM_EDGES[bucket]:
+            bucket += 1
+        stats.histogram[bucket] += 1
+        if frame_ms > FRAME_BUDGET_MS:
+            # Each whole budget the frame ran over is one display refresh that showed nothing new
+            stats.dropped_frames += int(frame_ms // FRAME_BUDGET_MS)
+        for name, elapsed in self.frame_phases.items():
+            stats.phase_totals[name] = stats.phase_totals.get(name, 0.0) + elapsed
+            stats.phase_max[name] = max(stats.phase_max.get(name, 0.0), elapsed)
+        if had_input:
+            stats.input_frames += 1
+            stats.input_latency_total_ms += frame_ms
+            stats.input_latency_max_ms = max(stats.input_latency_max_ms, frame_ms)
+
+        if len(self.slowest_frames) < SLOWEST_FRAMES_KEPT or frame_ms > self.slowest_frames[-1]["ms"]:
+            self.slowest_frames.append({"frame": self.frame_index, "screen": self.frame_screen,
+                                        "ms": frame_ms, "phases": dict(self.frame_phases)})
+            self.slowest_frames.sort(key=lambda frame: frame["ms"], reverse=True)
+            del self.slowest_frames[SLOWEST_FRAMES_KEPT:]
+        self.frame_index += 1
+
+    def summary(self):
+        summary = {
+            "frame_budget_ms": FRAME_BUDGET_MS,
+            "frames": self.frame_index,
+            "screens": {name: stats.to_dict() for name, stats in self.screens.items()},
+            "slowest_frames": self.slowest_frames,
+        }
+        if self.cprofile is not None:
+            text = io.StringIO()
+            pstats.Stats(self.cprofile, stream=text).sort_stats("cumulative").print_stats(25)
+            summary["cprofile_section"] = self.cprofile_section
+            summary["cprofile"] = text.getvalue()
+        return summary
+
+    def write_summary(self):
+        if not self.enabled or self.frame_index == 0:
+            return
+        summary = self.summary()
+        for name, stats in summary["screens"].items():
+            print(f"{name}: {stats['frames']} frames, avg {stats['average_ms']:.2f} ms, "
+                  f"max {stats['max_ms']:.2f} ms, {stats['dropped_frames']} dropped", file=sys.stderr)
+        if self.output_path:
+            with open(self.output_path, "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=4)
+            print(f"Frame profile written to {self.output_path}", file=sys.stderr)
@@ -1,9 +1,14 @@
 import pygame
 import sys
-import os
-import json
+import copy
+import queue
+import threading
+import time
 from game.game_manager import GameManager
-from ai.ai_manager import AIManager
+from ai.engines import AI_OPPONENTS, create_engine
+import settings.settings_manager as settings_manager
+from screens.assets import get_assets
+from screens.text_cache import get_text_cache
 
 class ScreenGame:
     def __init__(self, resolution, opponent, board_size, language, manager):
@@ -14,13 +19,28 @@ class ScreenGame:
         self.language = language
         self.manager = manager
         
-        base_dir = os.path.dirname(os.path.dirname(__file__))
-        lang_path = os.path.join(base_dir, "languages", "languages.json")
-        with open(lang_path, "r", encoding="utf-8") as f:
-            self.translations = json.load(f)
+        assets = get_assets()
+        self.translations = assets.translations()
 
         self.game_manager = GameManager(board_size)
-        self.ai_manager = AIManager(self.game_manager, ai_player=2)
+        ai_settings = settings_manager.get_ai_settings()
+        self.ai_manager = create_engine(opponent, self.game_manager, ai_settings, ai_player=2)
+
+        # AI turns run on a worker thread and hand their move back through a queue
+        self.ai_results = queue.Queue()
+        self.ai_thread = None
+        self.ai_stop = None
+        self.ai_thinking = False
+
+        # Pondering: while the human decides, search the position after their predicted reply
+        self.ponder_enabled = ai_settings.get("ponder", False)
+        self.ponder_thread = None
+        self.ponder_stop = None
+        self.ponder_target = None
+        self.ponder_result = None
+
+        # Search statistics overlay, toggled with F3
+        self.show_search_stats = ai_settings.get("debug_overlay", False)
 
         self.game_manager.set_selected_letter('S')
 
@@ -48,13 +68,25 @@ class ScreenGame:
         self.color_blue = (30, 30, 200)
         self.color_black = (0, 0, 0)
 
-        self.font_turn = pygame.font.SysFont(None, max(28, self.screen_width // 20))
-        self.font_points = pygame.font.SysFont(None, max(22, self.screen_width // 20))
-        self.font_button = pygame.font.SysFont(None, max(40, self.screen_width // 8))
-        self.font_back_button = pygame.font.SysFont(None, max(20, self.screen_width // 16))
+        self.font_turn = assets.font(None, max(28, self.screen_width // 20))
+        self.font_points = assets.font(None, max(22, self.screen_width // 20))
+        self.font_button = assets.font(None, max(40, self.screen_width // 8))
+        self.font_back_button = assets.font(None, max(20, self.screen_width // 16))
+        self.font_debug = assets.font(None, max(14, self.screen_width // 50))
+        self.font_winner = assets.font(None, max(36, self.screen_width // 25))
+        self.text_cache = get_text_cache()
 
         self.buttons = {}
         self.create_ui_elements()
+        self.layout_info_panel()
+        self.background = self.build_background()
+        self.back_hover_color = [0, 0, 0]
+        self.back_hover_target = [0, 0, 0]
+        # What was last drawn for each cell and widget, so draw() only redraws what changed
+        self.drawn_cells = {}
+        self.drawn_widgets = {}
+        self.needs_full_redraw = True
+        self.banner_drawn = False
 
         self.arrow_size = max(16, self.cell_size // 3)
         self.game_over = False
@@ -92,13 +124,18 @@ class ScreenGame:
         self.buttons['back'] = pygame.Rect(back_x, back_y, back_w, back_h)
 
     def handle_events(self, events):
+        for event in events:
+            if event.type == pygame.WINDOWEXPOSED:
+                self.needs_full_redraw = True
         if self.game_over:
             for event in events:
                 if event.type == pygame.QUIT:
+                    self.shutdown()
                     pygame.quit()
                     sys.exit()
                 elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                     if self.buttons['back'].collidepoint(event.pos):
+                        self.shutdown()
                         from screens.screen_menu import ScreenMenu
                         self.manager.set_screen(ScreenMenu(
                             self.resolution,
@@ -111,8 +148,11 @@ class ScreenGame:
 
         for event in events:
             if event.type == pygame.QUIT:
+                self.shutdown()
                 pygame.quit()
                 sys.exit()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.show_search_stats = not self.show_search_stats
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 mx, my = event.pos
 
@@ -129,7 +169,7 @@ class ScreenGame:
                             if self.game_manager.is_full():
                                 self.game_over = True
 
-                    elif self.opponent in ('ai', 'ia'):
+                    elif self.opponent in AI_OPPONENTS:
                         current_player = self.game_manager.get_current_player()
                         if current_player == 1:
                             valid, points = self.game_manager.place_letter(
@@ -140,31 +180,23 @@ class ScreenGame:
                                 self.letters_color[((my - self.grid_y) // self.cell_size,
                                                     (mx - self.grid_x) // self.cell_size)] = self.color_red
                                 if self.game_manager.is_full():
+                                    self.finish_ponder()
                                     self.game_over = True
-                                else:
-                                    while self.game_manager.get_current_player() == 2:
-                                        ai_move = self.ai_manager.best_move()
-                                        if not ai_move:
-                                            break
-
-                                        r, c, letter = ai_move
-                                        self.game_manager.set_selected_letter(letter)
-                                        valid_ai, points_ai = self.game_manager.place_letter(r, c)
-
-                                        if valid_ai:
-                                            self.letters_color[(r, c)] = self.color_blue
-
-                                        if self.game_manager.is_full():
-                                            self.game_over = True
-                                            break
+                                elif self.game_manager.get_current_player() == 2:
+                                    ponder_move = self.finish_ponder()
+                                    if ponder_move:
+                                        self.apply_ai_move(ponder_move)
+                                    else:
+                                        self.start_ai_turn()
 
                 for letter in ('O', 'S'):
                     if self.buttons[letter].collidepoint(mx, my):
-                        if self.opponent == 'human' or (self.opponent in ('ai', 'ia') and self.game_manager.get_current_player() == 1):
+                        if self.opponent == 'human' or (self.opponent in AI_OPPONENTS and self.game_manager.get_current_player() == 1):
 
                             self.game_manager.set_selected_letter(letter)
 
                 if self.buttons['back'].collidepoint(mx, my):
+                    self.shutdown()
                     from screens.screen_menu import ScreenMenu
                     self.manager.set_screen(ScreenMenu(
                         self.resolution,
@@ -174,158 +206,333 @@ class ScreenGame:
                         self.manager
                     ))
 
-    def draw(self, surface):
-        surface.fill(self.color_bg)
+    def start_ai_turn(self):
+        # The search works on its own copy, so the live game can keep being drawn meanwhile
+        self.ai_stop = threading.Event()
+        self.ai_thinking = True
+        self.ai_thread = threading.Thread(
+            target=self.run_ai_search,
+            args=(copy.deepcopy(self.game_manager), self.ai_stop),
+            daemon=True)
+        self.ai_thread.start()
+
+    def run_ai_search(self, game_state, stop_event):
+        ai_move = self.ai_manager.best_move(game_state, stop_event)
+        self.ai_results.put((stop_event, ai_move))
+
+    def cancel_ai_turn(self):
+        if self.ai_thinking:
+            self.ai_stop.set()
+            self.ai_thread.join()
+            self.ai_thinking = False
+
+    def start_ponder(self):
+        game_state = copy.deepcopy(self.game_manager)
+        for move in self.ai_manager.predicted_line(game_state, 1):
+            game_state.apply_move(*move)
+        # Without a usable prediction, search the human's own position to warm the table instead
+        if game_state.get_current_player() == 2 and not game_state.is_full():
+            self.ponder_target = self.position_signature(game_state)
+        else:
+            game_state = copy.deepcopy(self.game_manager)
+            self.ponder_target = None
+        self.ponder_result = None
+        self.ponder_stop = threading.Event()
+        self.ponder_thread = threading.Thread(
+            target=self.run_ponder,
+            args=(game_state, self.ponder_stop),
+            daemon=True)
+        self.ponder_thread.start()
+
+    def run_ponder(self, game_state, stop_event):
+        start = time.perf_counter()
+        ai_move = self.ai_manager.best_move(game_state, stop_event, ponder=True)
+        self.ponder_result = (ai_move, self.ai_manager.completed_depth, time.perf_counter() - start, self.ai_manager.ponder_stats)
+
+    def finish_ponder(self):
+        # Stops pondering; returns the pondered move if the human played the predicted reply
+        # and the ponder search went at least as far as a normal AI turn would
+        if self.ponder_thread is None:
+            return None
+        self.ponder_stop.set()
+        self.ponder_thread.join()
+        self.ponder_thread = None
+        if self.ponder_target is None or self.ponder_target != self.position_signature(self.game_manager):
+            return None
+
+        ai_move, depth, elapsed, stats = self.ponder_result
+        time_budget_ms = self.ai_manager.time_budget_ms
+        if time_budget_ms is None:
+            searched_enough = depth >= min(self.ai_manager.max_depth, self.game_manager.empty_count)
+        else:
+            searched_enough = elapsed * 1000 >= time_budget_ms
+        if not searched_enough:
+            return None
+        self.ai_manager.last_stats = stats
+        return ai_move
+
+    def shutdown(self):
+        # Leaving the screen or the game: a ponder search has no deadline, so its pool workers
+        # only stop when told to, and the interpreter waits for them on exit
+        self.finish_ponder()
+        self.cancel_ai_turn()
+        self.ai_manager.close()
+
+    def position_signature(self, game_state):
+        return (game_state.o_mask, game_state.s_mask, game_state.current_player,
+                game_state.players_points[1], game_state.players_points[2])
+
+    def needs_animation(self):
+        # Frames are only needed while the thinking dots move or the back button fades
+        return self.ai_thinking or self.back_hover_color != self.back_hover_target
+
+    def handle_escape(self):
+        # ESC while the AI thinks makes it play the best move found so far
+        if self.ai_thinking:
+            self.ai_stop.set()
+            return True
+        return False
+
+    def layout_info_panel(self):
+        # Info panel rows, worked out once from the font heights
+        self.panel_margin_x = int(self.info_side_w * 0.05)
+        self.panel_center_x = self.info_x + self.info_side_w // 2
+        spacing_block = int(self.screen_height * 0.08)
+        spacing_line = int(self.screen_height * 0.015)
+        turn_height = self.font_turn.get_height()
+        points_height = self.font_points.get_height()
 
-        grid_rect = pygame.Rect(self.grid_x, self.grid_y, self.grid_width, self.grid_height)
-        pygame.draw.rect(surface, self.color_bg, grid_rect)
-        pygame.draw.rect(surface, self.color_black, grid_rect, 2)
+        y = int(self.screen_height * 0.05)
+        self.turn_label_y = y
+        y += turn_height + spacing_line
+        self.player_area = pygame.Rect(self.info_x, y, self.info_side_w, points_height)
+        y += points_height + spacing_block
+        self.points_label_y = y
+        y += turn_height + spacing_line
+        self.p1_points_area = pygame.Rect(self.info_x, y, self.info_side_w, points_height)
+        y += points_height + spacing_line
+        self.p2_points_area = pygame.Rect(self.info_x, y, self.info_side_w, points_height)
+        y += points_height + spacing_block
+        self.select_letter_label_y = y
+        y += points_height + int(self.screen_height * 0.015)
+
+        btn_spacing = int(self.screen_width * 0.015)
+        total_btn_width = self.buttons['O'].width + self.buttons['S'].width + btn_spacing
+        btn_start_x = self.panel_center_x - total_btn_width // 2
+        for letter in ('O', 'S'):
+            self.buttons[letter].topleft = (btn_start_x, y)
+            btn_start_x += self.buttons[letter].width + btn_spacing
+
+        # Buttons and the arrow under the selected one
+        self.arrow_y = self.buttons['O'].bottom + int(self.screen_height * 0.01)
+        tri_size = max(16, self.cell_size // 3)
+        letter_area = self.buttons['O'].union(self.buttons['S'])
+        self.letter_buttons_area = pygame.Rect(letter_area.x - tri_size, letter_area.y,
+                                               letter_area.width + 2 * tri_size,
+                                               self.arrow_y + tri_size + 2 - letter_area.y)
 
+        grid_bottom = self.grid_y + self.grid_height + 2
+        self.thinking_area = pygame.Rect(0, grid_bottom, self.info_x, self.screen_height - grid_bottom)
+        self.debug_area = pygame.Rect(0, 0, self.info_x, self.grid_y)
+
+    def build_background(self):
+        # Everything that stays the same for the whole game, drawn once per resolution
+        background = pygame.Surface((self.screen_width, self.screen_height))
+        background.fill(self.color_bg)
+
+        grid_rect = pygame.Rect(self.grid_x, self.grid_y, self.grid_width, self.grid_height)
+        pygame.draw.rect(background, self.color_black, grid_rect, 2)
         for i in range(1, self.board_size):
             x = self.grid_x + i * self.cell_size
-            pygame.draw.line(surface, self.color_grid_lines, (x, self.grid_y), (x, self.grid_y + self.grid_height), 2)
+            pygame.draw.line(background, self.color_grid_lines, (x, self.grid_y), (x, self.grid_y + self.grid_height), 2)
         for i in range(1, self.board_size):
             y = self.grid_y + i * self.cell_size
-            pygame.draw.line(surface, self.color_grid_lines, (self.grid_x, y), (self.grid_x + self.grid_width, y), 2)
-
-        for r in range(self.board_size):
-            for c in range(self.board_size):
-                letter = self.game_manager.board[r][c]
-                if letter != '':
-                    center_x = self.grid_x + c * self.cell_size + self.cell_size // 2
-                    center_y = self.grid_y + r * self.cell_size + self.cell_size // 2
-                    color = self.letters_color.get((r, c), self.color_black)
-                    letter_render = self.font_turn.render(letter, True, color)
-                    letter_rect = letter_render.get_rect(center=(center_x, center_y))
-                    surface.blit(letter_render, letter_rect)
+            pygame.draw.line(background, self.color_grid_lines, (self.grid_x, y), (self.grid_x + self.grid_width, y), 2)
 
         info_rect = pygame.Rect(self.info_x, 0, self.info_side_w, self.screen_height)
-        pygame.draw.rect(surface, self.color_panel_bg, info_rect)
+        pygame.draw.rect(background, self.color_panel_bg, info_rect)
+
+        labels = (
+            (self.font_turn, 'turn', self.turn_label_y),
+            (self.font_turn, 'points', self.points_label_y),
+            (self.font_points, 'select_letter', self.select_letter_label_y),
+        )
+        for font, key, y in labels:
+            label_render = self.text_cache.render(font, self.translations[self.language][key], self.color_black)
+            background.blit(label_render, label_render.get_rect(center=(self.panel_center_x, y + label_render.get_height() // 2)))
+        return background
 
-        margin_x = int(self.info_side_w * 0.05)
-        y = int(self.screen_height * 0.05)
-        spacing_block = int(self.screen_height * 0.08)
-        spacing_line = int(self.screen_height * 0.015)
-
-        center_x = self.info_x + self.info_side_w // 2
-
-        # 1. Turn
-        turn_text = self.translations[self.language]['turn']
-        turn_render = self.font_turn.render(turn_text, True, self.color_black)
-        turn_rect = turn_render.get_rect(center=(center_x, y + turn_render.get_height() // 2))
-        surface.blit(turn_render, turn_rect)
-
-        y += turn_render.get_height() + spacing_line
+    def draw(self, surface):
+        # Only the parts that changed since the last frame are drawn; returns their rectangles
+        dirty = self.draw_changes(surface)
+        if self.game_over and dirty:
+            winner_render, winner_rect = self.winner_banner()
+            if not self.banner_drawn or any(winner_rect.colliderect(rect) for rect in dirty):
+                # The banner sits on top of the board, so everything under it is drawn again first
+                self.needs_full_redraw = True
+                dirty = self.draw_changes(surface)
+                surface.blit(winner_render, winner_rect)
+                self.banner_drawn = True
+        return dirty
+
+    def draw_changes(self, surface):
+        dirty = []
+        if self.needs_full_redraw:
+            surface.blit(self.background, (0, 0))
+            self.drawn_cells = {}
+            self.drawn_widgets = {}
+            self.needs_full_redraw = False
+            dirty.append(surface.get_rect())
+
+        board = self.game_manager.get_board()
+        for r in range(self.board_size):
+            for c in range(self.board_size):
+                letter = board[r][c]
+                key = (letter, self.letters_color.get((r, c), self.color_black)) if letter != '' else None
+                if self.drawn_cells.get((r, c)) == key:
+                    continue
+                self.drawn_cells[(r, c)] = key
+                cell_rect = pygame.Rect(self.grid_x + c * self.cell_size, self.grid_y + r * self.cell_size,
+                                        self.cell_size, self.cell_size)
+                surface.blit(self.background, cell_rect, cell_rect)
+                if key is not None:
+                    letter_render = self.text_cache.render(self.font_turn, letter, key[1])
+                    surface.blit(letter_render, letter_render.get_rect(center=cell_rect.center))
+                dirty.append(cell_rect)
 
-        # 2. Players
         current_player = self.game_manager.get_current_player()
+        p1_points = self.game_manager.get_player_points(1)
+        p2_points = self.game_manager.get_player_points(2)
+        selected_letter = self.game_manager.get_selected_letter()
+
+        # Back button hover fade
+        is_hovered = self.buttons['back'].collidepoint(pygame.mouse.get_pos())
+        self.back_hover_target = [50, 50, 50] if is_hovered else [0, 0, 0]
+        for i in range(3):
+            self.back_hover_color[i] += (self.back_hover_target[i] - self.back_hover_color[i]) * 0.15
+            if abs(self.back_hover_target[i] - self.back_hover_color[i]) < 0.5:
+                self.back_hover_color[i] = self.back_hover_target[i]
+        back_color = tuple(int(round(value)) for value in self.back_hover_color)
+
+        thinking_dots = pygame.time.get_ticks() // 400 % 4 if self.ai_thinking else None
+        stats = self.ai_manager.last_stats if self.show_search_stats else None
+
+        self.draw_widget(surface, dirty, 'player', current_player, self.player_area, self.draw_player)
+        self.draw_widget(surface, dirty, 'p1_points', p1_points, self.p1_points_area, self.draw_p1_points)
+        self.draw_widget(surface, dirty, 'p2_points', p2_points, self.p2_points_area, self.draw_p2_points)
+        self.draw_widget(surface, dirty, 'letter_buttons', (current_player, selected_letter),
+                         self.letter_buttons_area, self.draw_letter_buttons)
+        self.draw_widget(surface, dirty, 'back', back_color, self.buttons['back'], self.draw_back_button)
+        self.draw_widget(surface, dirty, 'thinking', thinking_dots, self.thinking_area, self.draw_thinking)
+        self.draw_widget(surface, dirty, 'search_stats', stats, self.debug_area, self.draw_search_stats)
+        return dirty
+
+    def draw_widget(self, surface, dirty, name, key, area, draw_function):
+        # Redraws one widget over its piece of the background when its key changes
+        if name in self.drawn_widgets and self.drawn_widgets[name] == key:
+            return
+        self.drawn_widgets[name] = key
+        surface.blit(self.background, area, area)
+        if key is not None:
+            previous_clip = surface.get_clip()
+            surface.set_clip(area)
+            draw_function(surface, key)
+            surface.set_clip(previous_clip)
+        dirty.append(area)
+
+    def draw_player(self, surface, current_player):
         player_key = 'player_1' if current_player == 1 else 'player_2'
         player_text = self.translations[self.language][player_key]
         player_color = self.color_red if current_player == 1 else self.color_blue
-        player_render = self.font_points.render(player_text, True, player_color)
-        player_rect = player_render.get_rect(center=(center_x, y + player_render.get_height() // 2))
-        surface.blit(player_render, player_rect)
-
-        y += player_render.get_height() + spacing_block
-
-        # 3. Points label
-        points_text = self.translations[self.language]['points']
-        points_render = self.font_turn.render(points_text, True, self.color_black)
-        points_rect = points_render.get_rect(center=(center_x, y + points_render.get_height() // 2))
-        surface.blit(points_render, points_rect)
+        player_render = self.text_cache.render(self.font_points, player_text, player_color)
+        surface.blit(player_render, player_render.get_rect(center=self.player_area.center))
 
-        y += points_render.get_height() + spacing_line
-
-        # 4. Player 1 points
-        p1_points = self.game_manager.get_player_points(1)
+    def draw_p1_points(self, surface, p1_points):
         p1_text = f"{self.translations[self.language]['player_1']}: {p1_points:02d}"
-        p1_render = self.font_points.render(p1_text, True, self.color_red)
-        p1_rect = p1_render.get_rect(topleft=(self.info_x + margin_x, y))
-        surface.blit(p1_render, p1_rect)
+        p1_render = self.text_cache.render(self.font_points, p1_text, self.color_red)
+        surface.blit(p1_render, (self.info_x + self.panel_margin_x, self.p1_points_area.y))
 
-        y += p1_render.get_height() + spacing_line
-
-        # 5. Player 2 points
-        p2_points = self.game_manager.get_player_points(2)
+    def draw_p2_points(self, surface, p2_points):
         p2_text = f"{self.translations[self.language]['player_2']}: {p2_points:02d}"
-        p2_render = self.font_points.render(p2_text, True, self.color_blue)
-        p2_rect = p2_render.get_rect(topleft=(self.info_x + margin_x, y))
-        surface.blit(p2_render, p2_rect)
-
-        y += p2_render.get_height() + spacing_block
-
-        # 6. Select letter
-        sel_letter_text = self.translations[self.language]['select_letter']
-        sel_letter_render = self.font_points.render(sel_letter_text, True, self.color_black)
-        sel_letter_rect = sel_letter_render.get_rect(center=(center_x, y + sel_letter_render.get_height() // 2))
-        surface.blit(sel_letter_render, sel_letter_rect)
-
-        y += sel_letter_render.get_height() + int(self.screen_height * 0.015)
+        p2_render = self.text_cache.render(self.font_points, p2_text, self.color_blue)
+        surface.blit(p2_render, (self.info_x + self.panel_margin_x, self.p2_points_area.y))
 
-        # Buttons O and S
-        total_btn_width = sum(btn.width for btn in [self.buttons['O'], self.buttons['S']]) + int(self.screen_width * 0.015)
-        btn_start_x = center_x - total_btn_width // 2
-
-        for i, letter in enumerate(('O', 'S')):
+    def draw_letter_buttons(self, surface, key):
+        current_player, selected_letter = key
+        current_turn_color = self.color_red if current_player == 1 else self.color_blue
+        for letter in ('O', 'S'):
             btn_rect = self.buttons[letter]
-            btn_rect.x = btn_start_x
-            btn_rect.y = y
-            btn_start_x += btn_rect.width + int(self.screen_width * 0.015)
-
-            current_turn_color = self.color_red if self.game_manager.get_current_player() == 1 else self.color_blue
             pygame.draw.rect(surface, current_turn_color, btn_rect, border_radius=8)
-            if self.game_manager.get_selected_letter() == letter:
+            if selected_letter == letter:
                 pygame.draw.rect(surface, self.color_black, btn_rect, 3, border_radius=8)
             else:
                 pygame.draw.rect(surface, self.color_black, btn_rect, 1, border_radius=8)
 
-            letter_render = self.font_button.render(letter, True, self.color_bg)
-            letter_rect = letter_render.get_rect(center=btn_rect.center)
-            surface.blit(letter_render, letter_rect)
+            letter_render = self.text_cache.render(self.font_button, letter, self.color_bg)
+            surface.blit(letter_render, letter_render.get_rect(center=btn_rect.center))
 
         # Arrow
-        selected_letter = self.game_manager.get_selected_letter()
-        selected_btn = self.buttons[selected_letter]
-        tri_x = selected_btn.centerx
-        tri_y = selected_btn.bottom + int(self.screen_height * 0.01)
         tri_size = max(16, self.cell_size // 3)
-        self.draw_triangle(surface, tri_x, tri_y, tri_size, self.color_black)
+        self.draw_triangle(surface, self.buttons[selected_letter].centerx, self.arrow_y, tri_size, self.color_black)
 
-        # Back Button
-        mouse_pos = pygame.mouse.get_pos()
+    def draw_back_button(self, surface, back_color):
         back_rect = self.buttons['back']
-        is_hovered = back_rect.collidepoint(mouse_pos)
-
-        if not hasattr(self, "back_hover_color"):
-            self.back_hover_color = [0, 0, 0]
-
-        target_color = [50, 50, 50] if is_hovered else [0, 0, 0]
-
-        for i in range(3):
-            self.back_hover_color[i] += (target_color[i] - self.back_hover_color[i]) * 0.15
-
-        pygame.draw.rect(surface, self.back_hover_color, back_rect, border_radius=12)
+        pygame.draw.rect(surface, back_color, back_rect, border_radius=12)
         pygame.draw.rect(surface, self.color_black, back_rect, width=2, border_radius=12)
 
         back_text = self.translations[self.language]['back']
-        back_render = self.font_back_button.render(back_text, True, (255, 255, 255))
-        back_rect_text = back_render.get_rect(center=back_rect.center)
-        surface.blit(back_render, back_rect_text)
-
-        if self.game_over:
-            winner = self.game_manager.get_winner()
-            if winner == 0:
-                winner_text = self.translations[self.language]['draw']
-            else:
-                winner_text = f"{self.translations[self.language]['winner']}: {self.translations[self.language][f'player_{winner}']}"
-            font_winner = pygame.font.SysFont(None, max(36, self.screen_width // 25))
-            winner_render = font_winner.render(winner_text, True, self.color_black)
-            winner_rect = winner_render.get_rect(center=(self.screen_width // 2, self.screen_height // 2))
-            surface.blit(winner_render, winner_rect)
+        back_render = self.text_cache.render(self.font_back_button, back_text, (255, 255, 255))
+        surface.blit(back_render, back_render.get_rect(center=back_rect.center))
+
+    def draw_thinking(self, surface, thinking_dots):
+        thinking_text = f"{self.translations[self.language]['thinking']}{'.' * thinking_dots}"
+        thinking_render = self.text_cache.render(self.font_points, thinking_text, self.color_blue)
+        thinking_rect = thinking_render.get_rect(midleft=(self.grid_x, self.grid_y + self.grid_height + self.grid_bottom_margin // 2))
+        surface.blit(thinking_render, thinking_rect)
+
+    def draw_search_stats(self, surface, stats):
+        debug_y = 2
+        for line in stats.summary_lines():
+            debug_render = self.text_cache.render(self.font_debug, line, self.color_grid_lines)
+            surface.blit(debug_render, (self.grid_x, debug_y))
+            debug_y += debug_render.get_height()
+
+    def winner_banner(self):
+        winner = self.game_manager.get_winner()
+        if winner == 0:
+            winner_text = self.translations[self.language]['draw']
+        else:
+            winner_text = f"{self.translations[self.language]['winner']}: {self.translations[self.language][f'player_{winner}']}"
+        winner_render = self.text_cache.render(self.font_winner, winner_text, self.color_black)
+        return winner_render, winner_render.get_rect(center=(self.screen_width // 2, self.screen_height // 2))
 
     def draw_triangle(self, surface, x, y, size, color):
         points = [(x, y), (x - size // 2, y + size), (x + size // 2, y + size)]
         pygame.draw.polygon(surface, color, points)
 
     def update(self):
-        pass
\ No newline at end of file
+        if not self.ai_thinking:
+            return
+        try:
+            stop_event, ai_move = self.ai_results.get_nowait()
+        except queue.Empty:
+            return
+        if stop_event is not self.ai_stop:
+            return
+        self.ai_thinking = False
+        if ai_move:
+            self.apply_ai_move(ai_move)
+
+    def apply_ai_move(self, ai_move):
+        r, c, letter = ai_move
+        self.game_manager.set_selected_letter(letter)
+        valid_ai, points_ai = self.game_manager.place_letter(r, c)
+        if valid_ai:
+            self.letters_color[(r, c)] = self.color_blue
+
+        if self.game_manager.is_full():
+            self.game_over = True
+        elif self.game_manager.get_current_player() == 2:
+            self.start_ai_turn()
+        elif self.ponder_enabled:
+            self.start_ponder()
\ No newline at end of file
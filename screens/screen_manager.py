@@ -13,13 +13,30 @@ class ScreenManager:
         if self.current_screen:
             self.current_screen.handle_events(events)
 
+    def handle_escape(self):
+        handler = getattr(self.current_screen, "handle_escape", None)
+        return bool(handler and handler())
+
+    def shutdown(self):
+        # Lets the current screen stop its background work before the program exits
+        handler = getattr(self.current_screen, "shutdown", None)
+        if handler:
+            handler()
+
+    def needs_animation(self):
+        # Screens without the method are drawn every frame
+        handler = getattr(self.current_screen, "needs_animation", None)
+        return handler is None or bool(handler())
+
     def update(self):
         if self.current_screen:
             self.current_screen.update()
 
     def draw(self, surface):
+        # A list of the rectangles that changed, or None when the whole surface was drawn
         if self.current_screen:
-            self.current_screen.draw(surface)
+            return self.current_screen.draw(surface)
+        return None
 
     def create_screen(resolution):
         return pygame.display.set_mode(resolution)
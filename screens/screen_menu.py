@@ -1,6 +1,6 @@
 import pygame
-import json
-import os
+from screens.assets import get_assets
+from screens.text_cache import get_text_cache
 
 class ScreenMenu:
     def __init__(self, resolution, opponent, board_size, language, manager):
@@ -13,17 +13,19 @@ class ScreenMenu:
         # Background
         self.background_x = 0
         self.background_speed = 1
-        self.background = pygame.image.load("assets/images/background.png")
+        assets = get_assets()
+        self.background = assets.image("background.png")
 
-        # Logo
-        base_dir = os.path.dirname(__file__)
-        logo_path = os.path.join(base_dir, "..", "assets", "images", "logo.png")
-        self.logo = pygame.image.load(logo_path)
+        # Logo, scaled once per resolution
+        logo_width = int(self.resolution[0] * 0.30)
+        logo_height = int(self.resolution[1] * 0.40)
+        self.logo = assets.scaled_image("Logo.png", (logo_width, logo_height))
 
         # Languages
-        lang_path = os.path.join(base_dir, "..", "languages", "languages.json")
-        with open(lang_path, "r", encoding="utf-8") as f:
-            self.LANGUAGES = json.load(f)
+        self.LANGUAGES = assets.translations()
+
+        self.font_title = assets.font("arial black", int(self.resolution[1] * 0.12))
+        self.text_cache = get_text_cache()
 
         self.buttons = []
         self._create_buttons()
@@ -38,6 +40,7 @@ class ScreenMenu:
         space_between_buttons_pct = 0.02
 
         first_button_y = int(self.resolution[1] * 0.55)
+        self.font_buttons = get_assets().font("arial black", int(button_height * 0.5))
         self.buttons = [
             (lang_data["play"], pygame.Rect(button_x, first_button_y, button_width, button_height)),
             (lang_data["options"], pygame.Rect(
@@ -68,23 +71,23 @@ class ScreenMenu:
         if self.background_x <= -self.background.get_width():
             self.background_x = 0
 
+    def needs_animation(self):
+        # The background never stops scrolling
+        return True
+
     def draw(self, screen):
         # Background scroll
         screen.blit(self.background, (self.background_x, -1))
         screen.blit(self.background, (self.background_x + self.background.get_width(), -1))
 
         # Logo
-        logo_width = int(self.resolution[0] * 0.30)
-        logo_height = int(self.resolution[1] * 0.40)
-        logo_scaled = pygame.transform.smoothscale(self.logo, (logo_width, logo_height))
         logo_x = self.resolution[0] // 2
         logo_y = int(self.resolution[1] * 0.05)
-        logo_rect = logo_scaled.get_rect(midtop=(logo_x, logo_y))
-        screen.blit(logo_scaled, logo_rect)
+        logo_rect = self.logo.get_rect(midtop=(logo_x, logo_y))
+        screen.blit(self.logo, logo_rect)
 
         # Tittle OSO
-        font_title = pygame.font.SysFont("arial black", int(self.resolution[1] * 0.12))
-        title_surface = font_title.render("OSO", True, (0, 0, 0))
+        title_surface = self.text_cache.render(self.font_title, "OSO", (0, 0, 0))
         title_y = logo_rect.bottom + int(self.resolution[1] * 0.03)
         title_rect = title_surface.get_rect(center=(self.resolution[0] // 2, title_y))
         screen.blit(title_surface, title_rect)
@@ -94,8 +97,6 @@ class ScreenMenu:
             self.draw_button(screen, text, rect)
 
     def draw_button(self, screen, text, rect):
-        font_buttons = pygame.font.SysFont("arial black", int(rect.height * 0.5))
-        
         # Hover
         mouse_pos = pygame.mouse.get_pos()
         if rect.collidepoint(mouse_pos):
@@ -104,6 +105,6 @@ class ScreenMenu:
             bg_color = (0, 0, 0) 
 
         pygame.draw.rect(screen, bg_color, rect, border_radius=int(rect.height * 0.15))
-        label = font_buttons.render(text, True, (255, 255, 255))
+        label = self.text_cache.render(self.font_buttons, text, (255, 255, 255))
         label_rect = label.get_rect(center=rect.center)
         screen.blit(label, label_rect)
\ No newline at end of file
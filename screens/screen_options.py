@@ -1,7 +1,7 @@
 import pygame
-import json
-import os
 import settings.settings_manager as settings_manager
+from screens.assets import get_assets
+from screens.text_cache import get_text_cache
 
 class ScreenOptions:
     def __init__(self, resolution, opponent, board_size, language, manager):
@@ -12,10 +12,7 @@ class ScreenOptions:
         self.manager = manager
 
         # Load translations
-        base_dir = os.path.dirname(os.path.dirname(__file__))
-        lang_path = os.path.join(base_dir, "languages", "languages.json")
-        with open(lang_path, "r", encoding="utf-8") as f:
-            self.translations = json.load(f)
+        self.translations = get_assets().translations()
 
         # Load settings
         self.settings = settings_manager.load_settings()
@@ -33,7 +30,8 @@ class ScreenOptions:
         self.current_lang_index = self.languages.index(language)
 
         # Font
-        self.font = pygame.font.SysFont("arial", int(resolution[1] * 0.05))
+        self.font = get_assets().font("arial", int(resolution[1] * 0.05))
+        self.text_cache = get_text_cache()
 
         # Layout
         self.update_layout()
@@ -62,12 +60,12 @@ class ScreenOptions:
 
         # Label
         label_text = f"{label}: "
-        label_surf = self.font.render(label_text, True, self.text_color)
+        label_surf = self.text_cache.render(self.font, label_text, self.text_color)
         label_rect = label_surf.get_rect(topleft=(self.label_x, y))
         surface.blit(label_surf, label_rect)
 
         # Value
-        value_surf = self.font.render(value, True, self.text_color)
+        value_surf = self.text_cache.render(self.font, value, self.text_color)
         arrow_size = max(int(self.resolution[1] * 0.06), 30)
         center_y = y + arrow_size // 2
 
@@ -195,7 +193,7 @@ class ScreenOptions:
         y += int(self.spacing * 1.5)
         mouse_pos = pygame.mouse.get_pos()
         back_text = tr.get("back", "Back")
-        back_surf = self.font.render(back_text, True, self.text_color)
+        back_surf = self.text_cache.render(self.font, back_text, self.text_color)
         text_rect = back_surf.get_rect(center=(self.resolution[0] // 2, y))
         self.back_rect = text_rect.inflate(30, 15)
 
@@ -207,7 +205,7 @@ class ScreenOptions:
         surface.blit(back_surf, text_rect)
 
     def update_layout(self):
-        self.font = pygame.font.SysFont("arial", int(self.resolution[1] * 0.05))
+        self.font = get_assets().font("arial", int(self.resolution[1] * 0.05))
         self.label_x = int(self.resolution[0] * 0.25)
         self.value_x = int(self.resolution[0] * 0.54)
         self.arrow_spacing = int(self.resolution[0] * 0.01)
@@ -215,4 +213,8 @@ class ScreenOptions:
         self.spacing = int(self.resolution[1] * 0.15)
 
     def update(self):
-        pass
\ No newline at end of file
+        pass
+
+    def needs_animation(self):
+        # Hovers change only when the mouse moves, which is an event
+        return False
\ No newline at end of file
@@ -0,0 +1,34 @@
+from collections import OrderedDict
+
+# Enough for every label of every screen plus a full 9x9 board in both player colours
+MAX_CACHED_TEXTS = 512
+
+_TEXT_CACHE = None
+
+def get_text_cache():
+    global _TEXT_CACHE
+    if _TEXT_CACHE is None:
+        _TEXT_CACHE = TextCache(MAX_CACHED_TEXTS)
+    return _TEXT_CACHE
+
+class TextCache:
+    # Rendered text surfaces keyed by (font, text, color), least recently used evicted first.
+    # Callers blit the surfaces and must not draw on them.
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+
+    def render(self, font, text, color):
+        key = (font, text, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
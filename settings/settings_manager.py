@@ -1,18 +1,92 @@
-import json, os
-from screens.screen_manager import ScreenManager
+import atexit, copy, json, os, tempfile, threading
 
 BASE_DIR = os.path.dirname(__file__)
 SETTINGS_PATH = os.path.join(BASE_DIR, "settings.json")
+# Changes made closer together than this are written to disk once
+SAVE_DELAY = 0.5
+
+_SETTINGS_STORE = None
+_MISSING = object()
+
+def get_settings_store():
+    global _SETTINGS_STORE
+    if _SETTINGS_STORE is None:
+        _SETTINGS_STORE = SettingsStore(SETTINGS_PATH, SAVE_DELAY)
+        atexit.register(_SETTINGS_STORE.flush)
+    return _SETTINGS_STORE
+
+class SettingsStore:
+    # settings.json read once and served from memory. Saves replace the file atomically after
+    # SAVE_DELAY without further changes; the file is read again if something else changes it.
+    def __init__(self, path, save_delay):
+        self.path = path
+        self.save_delay = save_delay
+        self.data = None
+        self.file_mtime = None
+        self.save_timer = None
+        self.lock = threading.Lock()
+
+    def read(self):
+        with self.lock:
+            mtime = self.current_mtime()
+            if mtime is None and self.data is None:
+                raise FileNotFoundError(f"Not Found: {self.path}")
+            # Unsaved changes win over the file until they are written
+            if self.data is None or (mtime is not None and mtime != self.file_mtime and self.save_timer is None):
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.data = json.load(f)
+                self.file_mtime = mtime
+            return self.data
+
+    def save(self, settings_data):
+        with self.lock:
+            self.data = copy.deepcopy(settings_data)
+            if self.save_timer is not None:
+                self.save_timer.cancel()
+            self.save_timer = threading.Timer(self.save_delay, self.flush)
+            self.save_timer.daemon = True
+            self.save_timer.start()
+
+    def flush(self):
+        with self.lock:
+            if self.save_timer is None:
+                return
+            self.save_timer.cancel()
+            self.save_timer = None
+            # Written next to the file and renamed over it, so it is never left half written
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), prefix=".settings-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(self.data, f, indent=4, ensure_ascii=False)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.path)
+            except BaseException:
+                os.remove(temp_path)
+                raise
+            self.file_mtime = self.current_mtime()
+
+    def current_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
 
 def load_settings():
-    if not os.path.exists(SETTINGS_PATH):
-        raise FileNotFoundError(f"Not Found: {SETTINGS_PATH}")
-    with open(SETTINGS_PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
+    # A copy, so callers can change it and hand it back to save_settings
+    return copy.deepcopy(get_settings_store().read())
 
 def save_settings(settings_data):
-    with open(SETTINGS_PATH, "w", encoding="utf-8") as f:
-        json.dump(settings_data, f, indent=4, ensure_ascii=False)
+    get_settings_store().save(settings_data)
+
+def get_setting(key, default=_MISSING):
+    settings = get_settings_store().read()
+    if default is not _MISSING:
+        return copy.deepcopy(settings.get(key, default))
+    return copy.deepcopy(settings[key])
+
+def flush_settings():
+    get_settings_store().flush()
 
 def ensure_max_resolution():
     settings = load_settings()
@@ -20,6 +94,8 @@ def ensure_max_resolution():
     if "max_scaled_resolution" in settings:
         return
 
+    # Imported here so the settings can be read without pygame (e.g. by the arena)
+    from screens.screen_manager import ScreenManager
     max_res = ScreenManager.get_display_resolution()
     max_res = [int(round(max_res[0])), int(round(max_res[1]))]
 
@@ -34,25 +110,28 @@ def ensure_max_resolution():
 
 # Getters
 def get_current_resolution():
-    return load_settings()["current_resolution"]
+    return get_setting("current_resolution")
 
 def get_current_opponent():
-    return load_settings()["current_opponent"]
+    return get_setting("current_opponent")
 
 def get_current_language():
-    return load_settings()["current_language"]
+    return get_setting("current_language")
 
 def get_current_board_size():
-    return load_settings()["current_board_size"]
+    return get_setting("current_board_size")
 
 def get_resolutions():
-    return load_settings()["resolutions"]
+    return get_setting("resolutions")
 
 def get_opponents():
-    return load_settings()["opponents"]
+    return get_setting("opponents")
 
 def get_board_sizes():
-    return load_settings()["board_sizes"]
+    return get_setting("board_sizes")
 
 def get_languages():
-    return load_settings()["languages"]
\ No newline at end of file
+    return get_setting("languages")
+
+def get_ai_settings():
+    return get_setting("ai", {})